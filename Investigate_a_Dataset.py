@@ -40,8 +40,14 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-get_ipython().run_line_magic('matplotlib', 'inline')
-get_ipython().run_line_magic('config', "InlineBackend.figure_format = 'retina'")
+
+# Notebook display settings, skipped when running as a plain Python script
+# (use `python -m tmdb report` for headless batch runs)
+try:
+    get_ipython().run_line_magic('matplotlib', 'inline')
+    get_ipython().run_line_magic('config', "InlineBackend.figure_format = 'retina'")
+except NameError:
+    pass
 
 
 # <a id='wrangling'></a>
@@ -53,8 +59,12 @@ get_ipython().run_line_magic('config', "InlineBackend.figure_format = 'retina'")
 
 
 # Load your data and print out a few lines.
+# Only the columns used in the analysis are parsed, with their dtypes set up
+# front and release dates parsed by the reader (see tmdb/loader.py).
+
+from tmdb.loader import DROPPED_COLUMNS, load_movies
 
-df = pd.read_csv('tmdb-movies.csv')
+df = load_movies('tmdb-movies.csv')
 
 df.head()
 
@@ -86,11 +96,16 @@ df.isna().sum()
 # In[8]:
 
 
-# Check duplicates in the data
+# Check duplicates in the data: every row is hashed once into a 64-bit
+# fingerprint, and the fingerprints are reused below to drop the duplicates
+
+from tmdb.dedup import Fingerprints, drop_duplicates
 
-df.duplicated()
+fingerprints = Fingerprints.of(df)
 
-sum(df.duplicated())
+duplicates = fingerprints.duplicated()
+
+duplicates.sum()
 
 
 # In[9]:
@@ -124,13 +139,13 @@ type(df['release_date'][0])
 # In[10]:
 
 
-# List of columns to be dropped
-columns_to_drop = ['id', 'imdb_id', 'popularity', 'budget_adj', 'revenue_adj', 'homepage', 'keywords', 'overview', 'production_companies', 'vote_count', 'vote_average']
+# List of columns that are not needed for the analysis
+columns_to_drop = DROPPED_COLUMNS
 
-# Removing specified columns from the dataframe
-df = df.drop(columns=columns_to_drop)
+# load_movies never reads these columns, so there is nothing left to drop
+assert not df.columns.isin(columns_to_drop).any()
 
-# Displaying a preview of the updated dataframe
+# Displaying a preview of the dataframe
 df.head()
 
 
@@ -139,7 +154,9 @@ df.head()
 # In[11]:
 
 
-df.release_date = pd.to_datetime(df['release_date'])
+# release_date is already parsed by load_movies with an explicit format and
+# moved into the century of release_year (6/9/66 is 1966, not 2066)
+df['release_date'].dtype
 
 
 # In[12]:
@@ -154,7 +171,8 @@ df.head(4)
 # In[13]:
 
 
-df.drop_duplicates(keep='first', inplace=True)
+# Keep the first of each group of identical rows, reusing the fingerprints
+df = drop_duplicates(df, fingerprints=fingerprints)
 
 
 # In[14]:
@@ -180,7 +198,8 @@ print('There are {} records and {} columns after removing duplicates.'.format(ro
 # In[16]:
 
 
-df['runtime'] = df['runtime'].replace(0, np.NAN)
+# runtime is a nullable Int32 column, so unknown runtimes become <NA>
+df['runtime'] = df['runtime'].replace(0, pd.NA)
 
 
 # In[17]:
@@ -207,11 +226,13 @@ import numpy as np
 # Create a list of revenue and budget columns
 bujrev_list = ['budget', 'revenue']
 
-# Replace all values of '0' with NaN in the specified columns
-df[bujrev_list] = df[bujrev_list].replace(0, np.NaN)
+# A '0' budget or revenue means the value is unknown. Build one mask over
+# both columns and filter once, instead of replacing with NaN and dropna
+# (each of which copies the frame)
+known = (df[bujrev_list].to_numpy() != 0).all(axis=1)
 
-# Remove all rows with NaN values in the bujrev list
-df.dropna(subset=bujrev_list, inplace=True)
+# Remove all rows with an unknown value in the bujrev list
+df = df[known]
 
 # Get the updated number of rows and columns in the dataframe
 rows, columns = df.shape
@@ -221,6 +242,7 @@ print('Now we have {} movies.'.format(rows))
 # #### Changing format of budget and revenue columns
 # 
 # Inintially budget and revenue columns were float point data types.
+# They are now read as int64, so this is a no-op kept for older CSV exports.
 
 # In[20]:
 
@@ -230,13 +252,31 @@ import numpy as np
 # List of columns for which data type needs to be changed
 change_type = ['budget', 'revenue']
 
-# Convert data types in the specified columns to np.int64
-df[change_type] = df[change_type].applymap(np.int64)
+# Convert data types in the specified columns to np.int64 in one vectorized
+# cast (tmdb.cleaning.clean_values runs all of these cleaning steps at once)
+df = df.astype({column: np.int64 for column in change_type})
 
 # Print to verify the changes in data types
 print(df.dtypes)
 
 
+# #### Compacting the column types
+# 
+# Most of the frame's memory is Python string objects. Directors and genres repeat a lot, so they become categoricals; titles, cast and taglines become Arrow strings; runtime and release year get the smallest integer type that holds them.
+
+# In[ ]:
+
+
+from tmdb.compact import compact_movies, memory_report
+
+compact_df = compact_movies(df)
+
+# Deep memory usage of every column before and after
+print(memory_report(df, compact_df))
+
+df = compact_df
+
+
 # <a id='eda'></a>
 # ## Exploratory Data Analysis
 # 
@@ -249,20 +289,13 @@ print(df.dtypes)
 
 import pprint
 
+from tmdb.extremes import extremes, top_k
+
 # Define the function
 def calculate(column):
-    # Find the index for the highest value
-    high_index = df[column].idxmax()
-    high_details = pd.DataFrame(df.loc[high_index])
-    
-    # Find the index for the lowest value
-    low_index = df[column].idxmin()
-    low_details = pd.DataFrame(df.loc[low_index])
-    
-    # Combine the values into the dataframe
-    info = pd.concat([high_details, low_details], axis=1)
-    
-    return info
+    # Find the rows with the highest and lowest value in a single pass
+    # and put them side by side, highest first
+    return extremes(df, [column]).details(df, column)
 
 # Invoke the function for the 'budget' column
 result = calculate('budget')
@@ -307,9 +340,15 @@ print(revenue_info.iloc[:, 1])  # Displaying the second column (lowest revenue)
 # In[23]:
 
 
-# Calculate Profit for each movie
+from tmdb.derived import DerivedColumns
+
+# Profit, ROI and revenue multiple are declared as expressions over budget
+# and revenue, and computed (once, with numexpr when available) when read
+derived = DerivedColumns(df)
 
-df.insert(2,'profit',df['revenue']-df['budget'])
+# Calculate Profit for each movie; it is shown with the movies below, so it
+# is stored in df once
+df.insert(2, 'profit', derived['profit'])
 
 #previewing changes
 df.head(2)
@@ -318,9 +357,13 @@ df.head(2)
 # In[22]:
 
 
+# Highest and lowest budget, revenue, profit, ROI and runtime, all computed
+# in one pass over the data and reused by the cells below
+movie_extremes = extremes(derived, ['budget', 'revenue', 'profit', 'roi', 'runtime'])
+
 # Movies with the highest and lowest Profit
 
-calculate('profit')
+movie_extremes.details(df, 'profit')
 
 
 # Movie with ID 1386 shows the highest earned profit i.e $2544505847.
@@ -330,11 +373,8 @@ calculate('profit')
 # In[24]:
 
 
-# Calculate profit by subtracting 'budget' from 'revenue'
-df['profit'] = df['revenue'] - df['budget']
-
-# Invoke the function for the 'profit' column
-profit_info = calculate('profit')
+# Reuse the extremes computed above for the 'profit' column
+profit_info = movie_extremes.details(df, 'profit')
 
 # Display the movies with the highest and lowest profit
 print("Movie with the Highest Profit:")
@@ -349,8 +389,8 @@ print(profit_info.iloc[:, 1])  # Displaying the second column (lowest profit)
 # In[23]:
 
 
-#Use the Calculate function.
-calculate('runtime')
+#Use the extremes computed with the profit.
+movie_extremes.details(df, 'runtime')
 
 
 # The movie with ID 2107 shows the longest runtime or duration about 338 minutes.
@@ -373,8 +413,11 @@ plt.show()
 # In[32]:
 
 
-# Calculate the correlation coefficient
-correlation_coefficient = np.corrcoef(df['runtime'], df['revenue'])[0, 1]
+from tmdb.correlation import correlation, pair_correlation
+
+# Calculate the correlation coefficient over the movies with a known runtime
+# (np.corrcoef would return NaN as soon as one runtime is missing)
+correlation_coefficient = pair_correlation(df, 'runtime', 'revenue')
 print(f'Correlation Coefficient: {correlation_coefficient}')
 
 
@@ -388,7 +431,7 @@ import seaborn as sns
 
 
 # Find movies with the longest and shortest runtime
-runtime_info = calculate('runtime')
+runtime_info = movie_extremes.details(df, 'runtime')
 
 # Display movies with the longest and shortest runtime
 print("Movie with the Longest Runtime:")
@@ -417,26 +460,33 @@ plt.show()
 # In[34]:
 
 
-#selecting the movies having profit of $50M or more
-profit_data = df[df['profit'] >= 50000000]
+from tmdb.dataset import MovieDataset
 
-#reindexing new data
-profit_data.index = range(len(profit_data))
+#wrapping the cleaned data so repeated analysis calls are served from a cache
+movies = MovieDataset(df, profit_threshold=50000000)
 
-#we will start from 1 instead of 0
-profit_data.index = profit_data.index + 1
+#selecting the movies having profit of $50M or more, as a selection over df
+#rather than a copy of those rows
+profit_data = movies.profitable()
 
-#print the changed dataset
+#print the first rows of the selection
 profit_data.head(3)
 
 
 # In[35]:
 
 
-#counting the no.of rows in the new data base
+#counting the no.of rows in the selection
 len(profit_data)
 
 
+# In[ ]:
+
+
+# The 100 most profitable movies, without sorting the whole frame
+top_k(df, 'profit', 100).head()
+
+
 # So our dataset is reduced to 1338 rows from 3853 (in earlier case).
 
 # #### A. Successful Genres
@@ -446,16 +496,9 @@ len(profit_data)
 
 #function which will take any column as argument from and keep its track 
 def data(column):
-    #will take a column, and separate the string by '|'
-    data = profit_data[column].str.cat(sep = '|')
-    
-    #giving pandas series and storing the values separately
-    data = pd.Series(data.split('|'))
-    
-    #arranging in descending order
-    count = data.value_counts(ascending = False)
-    
-    return count
+    #separates the strings of the column by '|' and counts the values among
+    #the profitable movies, arranged in descending order (cached per column)
+    return movies.data(column)
 
 
 # In[37]:
@@ -473,7 +516,7 @@ count.head()
 
 
 #lets plot the points in descending order top to bottom as we have data in same format.
-count.sort_values(ascending = True, inplace = True)
+count = count.sort_values(ascending = True)
 
 #ploting
 pt = count.plot.barh(color = '#00994C', fontsize = 15)
@@ -500,7 +543,7 @@ plt.show()
 
 #New function to find average 
 def profit_avg(column):
-    return profit_data[column].mean()
+    return movies.profit_avg(column)
 
 
 # In[40]:
@@ -549,11 +592,27 @@ count.head()
 
 # Tom Cruise is on the top for appearing the most in movies profiting more than $50M with total of 27 cast followed by Brad Pitt with 25 and Tom Hanks with 22.
 
+# In[ ]:
+
+
+# Which movies did Tom Cruise appear in, and what did they gross? The cast
+# index maps every name to the rows it appears in, so this is a lookup
+# instead of a scan of every cast string
+cast_index = movies.inverted_index('cast')
+tom_cruise = movies.segments().rows(cast_index.lookup('Tom Cruise'), 'Tom Cruise')
+
+print('{} movies, total revenue ${:,.0f}'.format(len(tom_cruise), tom_cruise.sum('revenue')))
+
+# Movies with both Tom Cruise and Nicole Kidman
+df.iloc[cast_index.all_of('Tom Cruise', 'Nicole Kidman')][['original_title', 'revenue']]
+
+
 # In[44]:
 
 
-# Calculate the correlation matrix
-correlation_matrix = df.corr()
+# Calculate the correlation matrix of the numeric columns, chunk by chunk
+# and skipping missing values pair by pair
+correlation_matrix = correlation(df)
 
 # Display a heatmap to visualize the correlation
 plt.figure(figsize=(12, 8))
@@ -569,7 +628,7 @@ plt.show()
 
 # define a function to find average of a column
 def avg_fun(column):
-    return df[column].mean()
+    return movies.avg(column)
 
 
 # In[47]:
@@ -605,7 +664,7 @@ plt.ylabel('No.of Movies in the Dataset', fontsize=15)
 plt.title('Runtime of all the movies', fontsize=18)
 
 #giving a histogram plot
-plt.hist(df['runtime'], rwidth = 0.9, bins =35)
+plt.hist(df['runtime'].dropna().to_numpy(dtype='float64'), rwidth = 0.9, bins =35)
 #displays the plot
 plt.show()
 
@@ -713,8 +772,18 @@ df['runtime'].describe()
 # In[60]:
 
 
+from tmdb.timeindex import TimeIndex
+
+# Sort the movies once by release year and date; every year is then a
+# contiguous block and a date range is a slice of the sorted frame
+time_index = TimeIndex.build(df)
+
+# Count, sum, sum of squares, min and max of every money and runtime column
+# for each release year, read off the year blocks
+yearly = time_index.yearly(['budget', 'revenue', 'profit', 'runtime'])
+
 # Calculate total profits earned by all movies for each release year
-profits_by_year = df.groupby('release_year')['profit'].sum()
+profits_by_year = yearly.sum('profit')
 
 # Plotting the total profits over release years
 plt.figure(figsize=(12, 6), dpi=130)
@@ -739,8 +808,8 @@ profits_by_year.idxmax()
 # In[64]:
 
 
-# Grouping data by release year and calculating total profit for each year
-profit_by_year = df.groupby('release_year')['profit'].sum()
+# Total profit for each year, read from the yearly aggregates
+profit_by_year = yearly.sum('profit')
 
 # Finding the year with the most total profit
 most_profitable_year = profit_by_year.idxmax()
@@ -750,6 +819,13 @@ total_profit_highest = profit_by_year.max()
 print(f"The most profitable year was {most_profitable_year} with a total profit of ${total_profit_highest:,.2f}")
 
 
+# In[65]:
+
+
+# Total profit of the movies released between March 2005 and November 2012
+time_index.sum('profit', '2005-03-01', '2012-11-30')
+
+
 # ### Question 9 - Which genres are most popular from year to year
 
 # In[66]:
@@ -759,18 +835,15 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-# Assuming 'genres' column contains multiple genres separated by '|'
-# Create a new DataFrame with one genre per row
-genres_df = df['genres'].str.split('|', expand=True).stack().reset_index(level=1, drop=True).rename('genre')
+from tmdb.crosstab import YearGenreCounts
 
-# Merge the new DataFrame with the original one
-df_genre = df.drop('genres', axis=1).join(genres_df)
-
-# Group by release year and genre, and calculate the count of each genre
-genre_counts_by_year = df_genre.groupby(['release_year', 'genre']).size().reset_index(name='count')
+# Assuming 'genres' column contains multiple genres separated by '|'
+# Count the movies of each genre per release year straight from the genre
+# codes, without exploding genres and joining them back onto df
+genre_counts_by_year = YearGenreCounts.from_frame(df)
 
 # Find the most popular genre for each year
-most_popular_genres = genre_counts_by_year.loc[genre_counts_by_year.groupby('release_year')['count'].idxmax()]
+most_popular_genres = genre_counts_by_year.most_popular()
 
 # Plotting a seaborn bar plot to visualize the most popular genres from year to year
 plt.figure(figsize=(14, 8))
@@ -850,8 +923,11 @@ plt.show()
 # In[71]:
 
 
-# Running this cell will execute a bash command to convert this notebook to an .html file
-get_ipython().system('python -m nbconvert --to html Investigate_a_Dataset.ipynb')
+# To export the results without re-executing and re-rendering the notebook
+# as HTML, run the headless report instead. It writes the tables as JSON
+# (or Parquet) and the figures as PNG files to the report/ directory:
+#
+#     python -m tmdb report --csv tmdb-movies.csv --out report
 
 
 # In[ ]:
@@ -0,0 +1,127 @@
+"""Synthetic ``tmdb-movies.csv`` data for the benchmarks.
+
+The generated frame has the same 21 columns as the TMDb export, with text
+columns of roughly the same width and a similar share of zero budgets and
+revenues, so relative timings carry over to the real file.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Number of rows in the original tmdb-movies.csv.
+TMDB_ROWS = 10866
+
+GENRES = [
+    'Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary',
+    'Drama', 'Family', 'Fantasy', 'Foreign', 'History', 'Horror', 'Music',
+    'Mystery', 'Romance', 'Science Fiction', 'TV Movie', 'Thriller', 'War',
+    'Western',
+]
+
+_WORDS = np.array([
+    'the', 'a', 'of', 'and', 'to', 'in', 'his', 'her', 'young', 'man',
+    'woman', 'world', 'life', 'love', 'family', 'war', 'city', 'secret',
+    'finds', 'must', 'new', 'story', 'after', 'when', 'two', 'friends',
+    'journey', 'dark', 'past', 'home', 'team', 'mission', 'town', 'night',
+])
+
+
+def _phrases(rng, count, min_words, max_words):
+    lengths = rng.integers(min_words, max_words + 1, size=count)
+    return np.array([' '.join(rng.choice(_WORDS, size=n)) for n in lengths], dtype=object)
+
+
+def _names(rng, count):
+    first = _phrases(rng, count, 1, 1)
+    last = _phrases(rng, count, 1, 1)
+    return np.array(
+        ['{} {}{}'.format(f.title(), l.title(), i) for i, (f, l) in enumerate(zip(first, last))],
+        dtype=object,
+    )
+
+
+def _pipe_joined(rng, vocabulary, count, min_items, max_items):
+    lengths = rng.integers(min_items, max_items + 1, size=count)
+    return np.array(
+        ['|'.join(rng.choice(vocabulary, size=n, replace=False)) for n in lengths],
+        dtype=object,
+    )
+
+
+def _pick(rng, pool, rows, missing=0.0):
+    values = pool[rng.integers(0, len(pool), size=rows)]
+    if missing:
+        values = values.copy()
+        values[rng.random(rows) < missing] = None
+    return values
+
+
+def synthetic_movies(rows, seed=0, pool_size=20000):
+    """Return a DataFrame shaped like the raw TMDb CSV with ``rows`` rows.
+
+    Text values are drawn from pools of ``pool_size`` distinct strings so
+    generation stays fast for millions of rows.
+    """
+    rng = np.random.default_rng(seed)
+    actors = _names(rng, pool_size)
+    directors = _names(rng, pool_size // 4)
+
+    release_year = rng.integers(1960, 2016, size=rows)
+    month = rng.integers(1, 13, size=rows)
+    day = rng.integers(1, 29, size=rows)
+    release_date = np.char.add(
+        np.char.add(np.char.add(month.astype(str), '/'), np.char.add(day.astype(str), '/')),
+        np.char.zfill((release_year % 100).astype(str), 2),
+    ).astype(object)
+
+    budget = rng.integers(1, 425_000_000, size=rows)
+    revenue = rng.integers(1, 2_800_000_000, size=rows)
+    budget[rng.random(rows) < 0.52] = 0
+    revenue[rng.random(rows) < 0.55] = 0
+    runtime = rng.normal(102, 30, size=rows).clip(0, 900).round().astype(np.int64)
+    runtime[rng.random(rows) < 0.003] = 0
+
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'imdb_id': np.char.add('tt', np.arange(rows).astype(str)).astype(object),
+        'popularity': rng.random(rows) * 30,
+        'budget': budget,
+        'revenue': revenue,
+        'original_title': _pick(rng, _phrases(rng, pool_size, 1, 5), rows),
+        'cast': _pick(rng, _pipe_joined(rng, actors, pool_size, 3, 5), rows, missing=0.007),
+        'homepage': _pick(rng, np.char.add('http://www.', _phrases(rng, pool_size, 1, 1).astype(str)).astype(object), rows, missing=0.72),
+        'director': _pick(rng, directors, rows, missing=0.004),
+        'tagline': _pick(rng, _phrases(rng, pool_size, 4, 12), rows, missing=0.26),
+        'keywords': _pick(rng, _pipe_joined(rng, _WORDS, pool_size, 3, 5), rows, missing=0.14),
+        'overview': _pick(rng, _phrases(rng, pool_size, 30, 70), rows),
+        'runtime': runtime,
+        'genres': _pick(rng, _pipe_joined(rng, np.array(GENRES), 2000, 1, 4), rows, missing=0.002),
+        'production_companies': _pick(rng, _phrases(rng, pool_size, 2, 10), rows, missing=0.09),
+        'release_date': release_date,
+        'vote_count': rng.integers(10, 10000, size=rows),
+        'vote_average': rng.random(rows) * 10,
+        'release_year': release_year,
+        'budget_adj': budget * 1.3,
+        'revenue_adj': revenue * 1.3,
+    })
+    return df
+
+
+def write_synthetic_csv(path, rows, seed=0):
+    """Write ``synthetic_movies(rows)`` to ``path`` and return the path."""
+    synthetic_movies(rows, seed=seed).to_csv(path, index=False)
+    return path
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes.
+
+    Reads ``VmHWM`` rather than ``ru_maxrss``, which on Linux carries over
+    the parent's peak across fork and exec.
+    """
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) * 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
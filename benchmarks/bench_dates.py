@@ -0,0 +1,68 @@
+"""Release-date parsing: ``pd.to_datetime`` without a format vs ``tmdb.dates``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_dates --sizes 10866 1000000 10000000
+
+Also reports how many dates each variant puts in a year other than the
+row's ``release_year``.
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._synthetic import synthetic_movies
+from tmdb.dates import parse_release_dates
+
+
+def inferred(df):
+    """The notebook's call."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # "Could not infer format"
+        return pd.to_datetime(df['release_date'])
+
+
+def mixed(df):
+    """Inference element by element, as older pandas did for this column."""
+    return pd.to_datetime(df['release_date'], format='mixed')
+
+
+def explicit(df):
+    """Explicit format and century reconciliation on object strings."""
+    return parse_release_dates(df)
+
+
+def categorical(df):
+    """As ``explicit``, with the column read as categories like ``load_movies``."""
+    df = df.assign(release_date=df['release_date'].astype('category'))
+    return parse_release_dates(df)
+
+
+VARIANTS = {'inferred': inferred, 'mixed': mixed, 'explicit': explicit, 'categorical': categorical}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10866, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print('{:>12} {:>12} {:>10} {:>14}'.format('rows', 'variant', 'seconds', 'wrong century'))
+    for rows in args.sizes:
+        df = synthetic_movies(rows)[['release_date', 'release_year']]
+        for name, parse in VARIANTS.items():
+            best = np.inf
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                dates = parse(df)
+                best = min(best, time.perf_counter() - start)
+            wrong = int((dates.dt.year != df['release_year']).sum())
+            print('{:>12,} {:>12} {:>10.3f} {:>14,}'.format(rows, name, best, wrong))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Compare the typed, pruned loader with the original load-then-drop flow.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_loader --scale 100
+
+Each variant runs in its own interpreter so peak RSS is measured in
+isolation.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks._synthetic import TMDB_ROWS, peak_rss, write_synthetic_csv
+
+
+def _original(path):
+    import pandas as pd
+    from tmdb.loader import DROPPED_COLUMNS
+
+    df = pd.read_csv(path)
+    df = df.drop(columns=DROPPED_COLUMNS)
+    df.release_date = pd.to_datetime(df['release_date'], format='mixed')
+    return df
+
+
+def _typed(path):
+    from tmdb.loader import load_movies
+
+    return load_movies(path)
+
+
+VARIANTS = {'original': _original, 'typed': _typed}
+
+
+def _run_variant(name, path):
+    start = time.perf_counter()
+    df = VARIANTS[name](path)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss()
+    print(json.dumps({'variant': name, 'seconds': elapsed, 'peak_rss': peak, 'rows': len(df)}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=100, help='multiple of the TMDb row count')
+    parser.add_argument('--csv', help='reuse an existing CSV instead of generating one')
+    parser.add_argument('--variant', choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.variant:
+        _run_variant(args.variant, args.csv)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv or write_synthetic_csv(os.path.join(tmp, 'tmdb-movies.csv'), TMDB_ROWS * args.scale)
+        print('{} ({:.1f} MB)'.format(path, os.path.getsize(path) / 1e6))
+        for name in ('original', 'typed'):
+            out = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_loader', '--variant', name, '--csv', path],
+                check=True, capture_output=True, text=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            print('{variant:>9}: {seconds:7.2f} s  peak RSS {mb:8.1f} MB  ({rows} rows)'.format(
+                mb=result['peak_rss'] / 1e6, **result))
+
+
+if __name__ == '__main__':
+    main()
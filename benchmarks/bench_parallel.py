@@ -0,0 +1,68 @@
+"""Scaling of ``tmdb.parallel.run_questions`` with the number of workers.
+
+Synthetic column buffers are built directly (no CSV, no pandas frame), so
+the row count can go well past what fits as a frame.  Run from the
+repository root::
+
+    python -m benchmarks.bench_parallel --rows 1000000 50000000 --workers 1 2 4 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._synthetic import GENRES
+from tmdb.parallel import ColumnBuffers, run_questions
+from tmdb.tokens import Tokens
+
+
+def _tokens(rng, rows, vocabulary, per_row):
+    lengths = rng.integers(1, per_row + 1, size=rows)
+    offsets = np.zeros(rows + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codes = rng.integers(0, len(vocabulary), size=offsets[-1]).astype(np.int32)
+    return Tokens(codes, offsets, np.asarray(vocabulary, dtype=object))
+
+
+def synthetic_buffers(rows, seed=0, cast_size=20_000):
+    """Column buffers with TMDb-like value ranges."""
+    rng = np.random.default_rng(seed)
+    budget = rng.integers(1, 425_000_000, size=rows)
+    revenue = rng.integers(1, 2_800_000_000, size=rows)
+    runtime = rng.integers(60, 180, size=rows).astype('float64')
+    runtime[rng.random(rows) < 0.003] = np.nan
+    columns = {
+        'budget': budget,
+        'revenue': revenue,
+        'profit': revenue - budget,
+        'runtime': runtime,
+        'release_year': rng.integers(1960, 2016, size=rows),
+    }
+    cast = ['actor {}'.format(i) for i in range(cast_size)]
+    return ColumnBuffers(columns, _tokens(rng, rows, GENRES, 3), _tokens(rng, rows, cast, 5),
+                         pd.RangeIndex(rows))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--by', choices=['rows', 'release_year'], default='rows')
+    args = parser.parse_args(argv)
+
+    print('{:>12} {:>8} {:>10} {:>8}'.format('rows', 'workers', 'seconds', 'speedup'))
+    for rows in args.rows:
+        buffers = synthetic_buffers(rows)
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            run_questions(buffers, workers=workers, by=args.by)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print('{:>12,} {:>8} {:>10.2f} {:>8.2f}'.format(rows, workers, elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Load test of ``python -m tmdb serve``: latency percentiles per endpoint.
+
+Starts the server in a subprocess on a synthetic CSV and measures three
+phases:
+
+* cold: the first request to every endpoint, when nothing is cached and the
+  aggregation itself runs;
+* uncached: ``--connections`` keep-alive connections sending ``--requests``
+  requests each, every URL distinct (varying ``k``, cast and a cache-busting
+  parameter), so each one misses the response cache;
+* cached: the same load repeating a fixed set of URLs, so responses come
+  from the per-version cache.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_server --scale 10 --connections 32 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+from benchmarks._synthetic import TMDB_ROWS, write_synthetic_csv
+
+ENDPOINTS = [
+    '/health',
+    '/extremes',
+    '/extremes?column=profit',
+    '/averages',
+    '/profits-by-year',
+    '/most-profitable-year',
+    '/top-genres?k=10',
+    '/top-cast?k=20',
+    '/popular-genres',
+]
+
+
+async def _get(reader, writer, target):
+    writer.write('GET {} HTTP/1.1\r\nHost: bench\r\n\r\n'.format(target).encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, targets, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            status = await _get(reader, writer, target)
+            latencies.setdefault(target.split('?')[0], []).append(time.perf_counter() - start)
+            if status != 200:
+                errors.append((target, status))
+    finally:
+        writer.close()
+
+
+async def _top_cast(host, port, k):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write('GET /top-cast?k={} HTTP/1.1\r\nConnection: close\r\n\r\n'.format(k).encode())
+    await writer.drain()
+    body = (await reader.read()).partition(b'\r\n\r\n')[2]
+    writer.close()
+    return [entry['cast'] for entry in json.loads(body)]
+
+
+async def _load(host, port, plans):
+    """Run one client per list of targets in ``plans``, concurrently."""
+    latencies, errors = {}, []
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, targets, latencies, errors) for targets in plans])
+    return latencies, errors, time.perf_counter() - start
+
+
+def _uncached_targets(count, cast, rng):
+    """``count`` distinct URLs over every endpoint."""
+    targets = []
+    for i in range(count):
+        endpoint = rng.choice(ENDPOINTS + ['/movies'])
+        if endpoint.startswith('/top-'):
+            endpoint = endpoint.split('?')[0] + '?k={}'.format(rng.randrange(1, 500))
+        elif endpoint == '/movies':
+            endpoint += '?' + urlencode({'cast': rng.choice(cast), 'limit': rng.randrange(1, 100)})
+        targets.append('{}{}_={}'.format(endpoint, '&' if '?' in endpoint else '?', i))
+    return targets
+
+
+def _print_latencies(label, latencies, errors, elapsed):
+    total = sum(len(values) for values in latencies.values())
+    print('\n{}: {:,} requests in {:.2f} s ({:,.0f} req/s), {} errors'.format(
+        label, total, elapsed, total / elapsed, len(errors)))
+    print('{:>24} {:>8} {:>10} {:>10}'.format('endpoint', 'count', 'p50 ms', 'p99 ms'))
+    for endpoint, values in sorted(latencies.items()) + [('all', sum(latencies.values(), []))]:
+        p50, p99 = np.percentile(values, [50, 99]) * 1000
+        print('{:>24} {:>8,} {:>10.2f} {:>10.2f}'.format(endpoint, len(values), p50, p99))
+
+
+def _start_server(csv, cache_dir):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'tmdb', 'serve', '--csv', csv, '--port', '0'],
+        cwd=cache_dir, stdout=subprocess.PIPE, text=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join([os.getcwd(), os.environ.get('PYTHONPATH', '')])),
+    )
+    line = process.stdout.readline()
+    match = re.search(r'http://([^:]+):(\d+)', line)
+    if not match:
+        process.kill()
+        raise RuntimeError('server did not start: {!r}'.format(line))
+    return process, match.group(1), int(match.group(2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=10, help='multiple of the TMDb row count')
+    parser.add_argument('--csv', help='reuse an existing CSV instead of generating one')
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200, help='requests per connection')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = os.path.abspath(args.csv or write_synthetic_csv(os.path.join(tmp, 'tmdb-movies.csv'),
+                                                              TMDB_ROWS * args.scale))
+        started = time.perf_counter()
+        process, host, port = _start_server(csv, tmp)
+        print('server ready in {:.1f} s'.format(time.perf_counter() - started))
+        try:
+            rng = random.Random(0)
+            # cold: nothing cached yet; /top-cast also gives names for /movies
+            cold, _, _ = asyncio.run(_load(host, port, [ENDPOINTS]))
+            cast = asyncio.run(_top_cast(host, port, 200))
+            movies = '/movies?' + urlencode({'cast': cast[0]})
+            cold.update(asyncio.run(_load(host, port, [[movies]]))[0])
+            print('{:>24} {:>10}'.format('cold endpoint', 'ms'))
+            for endpoint, values in sorted(cold.items()):
+                print('{:>24} {:>10.2f}'.format(endpoint, values[0] * 1000))
+
+            plans = [_uncached_targets(args.requests, cast, rng) for _ in range(args.connections)]
+            _print_latencies('uncached', *asyncio.run(_load(host, port, plans)))
+
+            targets = ENDPOINTS + [movies]
+            plans = [[rng.choice(targets) for _ in range(args.requests)] for _ in range(args.connections)]
+            _print_latencies('cached', *asyncio.run(_load(host, port, plans)))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+GENRES = ['Action', 'Comedy', 'Drama', 'Horror', 'Romance', 'Science Fiction', 'Thriller']
+
+
+def _joined(rng, pool, rows, most):
+    return ['|'.join(rng.choice(pool, size=rng.integers(1, most + 1), replace=False)) for _ in range(rows)]
+
+
+@pytest.fixture(scope='session')
+def movies():
+    """Small cleaned-movies frame with a ``profit`` column and some missing runtimes."""
+    rng = np.random.default_rng(7)
+    rows = 600
+    budget = rng.integers(1, 200, size=rows) * 1_000_000
+    revenue = (budget * rng.lognormal(0.3, 0.8, size=rows)).astype(np.int64)
+    runtime = rng.normal(105, 20, size=rows).round()
+    runtime[rng.random(rows) < 0.05] = np.nan
+    cast = np.array(['Actor {}'.format(i) for i in range(80)])
+    frame = pd.DataFrame({
+        'original_title': ['Movie {}'.format(i) for i in range(rows)],
+        'budget': budget,
+        'revenue': revenue,
+        'profit': revenue - budget,
+        'runtime': runtime,
+        'release_year': rng.integers(1990, 2016, size=rows),
+        'genres': _joined(rng, GENRES, rows, 3),
+        'cast': _joined(rng, cast, rows, 5),
+    })
+    # labels that are not positions, as after cleaning
+    frame.index = rng.permutation(rows * 2)[:rows]
+    return frame
@@ -0,0 +1,33 @@
+"""Reference helpers shared by the tests."""
+
+import numpy as np
+
+
+def split_rows(frame, parts):
+    """``frame`` cut into ``parts`` contiguous row ranges."""
+    return [frame.iloc[cut] for cut in np.array_split(np.arange(len(frame)), parts)]
+
+
+def exploded(frame, column):
+    """One row per '|'-separated value of ``column``, named ``value``."""
+    return frame.assign(value=frame[column].str.split('|')).explode('value')
+
+
+def merged(parts, build):
+    """``build`` each of ``parts`` and merge the results into the first."""
+    result = build(parts[0])
+    for part in parts[1:]:
+        result.merge(build(part))
+    return result
+
+
+def write_raw_csv(frame, path):
+    """Write ``frame`` (the ``movies`` fixture) as a raw ``tmdb-movies.csv`` at ``path``."""
+    years = frame['release_year']
+    raw = frame.drop(columns='profit').assign(
+        director='Director ' + (frame.index % 40).astype(str),
+        tagline='',
+        release_date=['{}/{}/{:02d}'.format(1 + i % 12, 1 + i % 28, year % 100) for i, year in enumerate(years)],
+    )
+    raw.to_csv(path, index=False)
+    return str(path)
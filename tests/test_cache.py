@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from tests.helpers import write_raw_csv
+from tmdb import cache
+from tmdb.cache import cached_clean_movies
+from tmdb.invindex import cached_index
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def sources(tmp_path, movies):
+    return (write_raw_csv(movies.iloc[:300], tmp_path / 'a.csv'),
+            write_raw_csv(movies.iloc[300:], tmp_path / 'b.csv'))
+
+
+def _no_rebuild(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('the cache was rebuilt')
+    monkeypatch.setattr(cache, 'load_clean_movies', fail)
+
+
+def _entries(cache_dir, prefix):
+    return sorted(name for name in os.listdir(cache_dir) if name.startswith(prefix))
+
+
+def test_hit_matches_miss(tmp_path, sources):
+    cache_dir = str(tmp_path / 'cache')
+    miss = cached_clean_movies(sources[0], cache_dir=cache_dir)
+    hit = cached_clean_movies(sources[0], cache_dir=cache_dir)
+    assert miss.dtypes.equals(hit.dtypes)
+    assert miss.equals(hit)
+
+
+def test_sources_keep_their_caches(tmp_path, sources, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    for path in sources:
+        cached_clean_movies(path, cache_dir=cache_dir)
+        cached_index(path, 'cast', cache_dir=cache_dir)
+    assert len(_entries(cache_dir, 'movies-')) == 2
+    assert len(_entries(cache_dir, 'index-')) == 2
+
+    _no_rebuild(monkeypatch)
+    for path in sources * 2:
+        cached_clean_movies(path, cache_dir=cache_dir)
+        cached_index(path, 'cast', cache_dir=cache_dir)
+
+
+def test_new_version_replaces_only_its_source(tmp_path, sources, movies):
+    cache_dir = str(tmp_path / 'cache')
+    for path in sources:
+        cached_clean_movies(path, cache_dir=cache_dir)
+        cached_index(path, 'cast', cache_dir=cache_dir)
+    before = set(_entries(cache_dir, 'movies-')) | set(_entries(cache_dir, 'index-'))
+
+    write_raw_csv(movies.iloc[:200], sources[0])
+    assert len(cached_clean_movies(sources[0], cache_dir=cache_dir)) <= 200
+    cached_index(sources[0], 'cast', cache_dir=cache_dir)
+    after = set(_entries(cache_dir, 'movies-')) | set(_entries(cache_dir, 'index-'))
+
+    source_a, source_b = (cache.source_id(path) for path in sources)
+    assert len(after) == 4
+    assert before - after == {name for name in before if source_a in name}
+    assert {name for name in after if source_b in name} == {name for name in before if source_b in name}
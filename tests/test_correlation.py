@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from tests.helpers import merged, split_rows
+from tmdb.correlation import CorrelationAccumulator
+
+COLUMNS = ['budget', 'revenue', 'profit', 'runtime', 'release_year']
+
+
+@pytest.mark.parametrize('shift', [None, 'shared'])
+def test_correlation_accumulator(movies, shift):
+    shared = movies[COLUMNS].mean().to_numpy() if shift else None
+
+    def build(part):
+        accumulator = CorrelationAccumulator(COLUMNS, shift=shared)
+        accumulator.update(part)
+        return accumulator
+
+    accumulator = merged(split_rows(movies, 6), build)
+    pd.testing.assert_frame_equal(accumulator.correlation(), movies[COLUMNS].corr(), atol=1e-9)
+
+
+def test_correlation_accumulator_rejects_other_columns(movies):
+    first = CorrelationAccumulator(['budget', 'revenue'])
+    with pytest.raises(ValueError):
+        first.merge(CorrelationAccumulator(['budget', 'runtime']))
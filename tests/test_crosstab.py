@@ -0,0 +1,14 @@
+import pandas as pd
+
+from tests.helpers import exploded, merged, split_rows
+from tmdb.crosstab import YearGenreCounts
+
+
+def test_year_genre_counts(movies):
+    # partitions see different genres in a different order
+    parts = split_rows(movies.sort_values('genres'), 5)
+    table = merged(parts, YearGenreCounts.from_frame).table()
+    expected = exploded(movies, 'genres').groupby(['release_year', 'value']).size().unstack(fill_value=0)
+    pd.testing.assert_frame_equal(table.loc[expected.index, expected.columns], expected,
+                                  check_names=False, check_dtype=False)
+    assert table.drop(index=expected.index, errors='ignore').to_numpy().sum() == 0
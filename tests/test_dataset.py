@@ -0,0 +1,50 @@
+import pandas as pd
+
+from tmdb.dataset import MovieDataset
+
+THRESHOLD = 50_000_000
+
+
+def _dataset(movies):
+    return MovieDataset(movies.drop(columns='profit'), profit_threshold=THRESHOLD)
+
+
+def test_profit_is_derived(movies):
+    dataset = _dataset(movies)
+    assert 'profit' not in dataset.frame
+    assert (dataset.derived()['profit'] == movies['profit'].to_numpy()).all()
+
+    highest = dataset.calculate('profit')
+    assert list(highest.columns) == [movies['profit'].idxmax(), movies['profit'].idxmin()]
+    assert highest.loc['profit'].tolist() == [movies['profit'].max(), movies['profit'].min()]
+
+
+def test_profit_data(movies):
+    expected = movies[movies['profit'] >= THRESHOLD].reset_index(drop=True)
+    expected.index = range(1, len(expected) + 1)
+    pd.testing.assert_frame_equal(_dataset(movies).profit_data(), expected[list(movies.columns)])
+
+
+def test_cache_counts_only_analyses(movies):
+    dataset = _dataset(movies)
+    dataset.data('cast')
+    dataset.data('cast')
+    info = dataset.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_helpers_survive_lru_pressure(movies):
+    dataset = MovieDataset(movies.drop(columns='profit'), cache_size=1)
+    segments = dataset.segments()
+    dataset.data('genres')
+    dataset.data('cast')
+    dataset.yearly(['budget'])
+    assert dataset.segments() is segments
+
+    dataset.changed()
+    assert dataset.segments() is not segments
+
+
+def test_list_arguments(movies):
+    dataset = _dataset(movies)
+    assert dataset.extremes(['budget']) is dataset.extremes(('budget',))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tmdb.dates import parse_dates, parse_release_dates, reconcile_century
+
+
+@pytest.fixture
+def releases():
+    return pd.DataFrame({
+        'release_date': ['6/9/66', '12/25/15', '6/9/66', None, '1/1/69', '12/25/15', 'not a date', '2/29/68'],
+        'release_year': [1966, 2015, 1966, 2001, 1969, 2015, 2003, 1968],
+    }, index=[7, 3, 5, 1, 0, 2, 9, 4])
+
+
+EXPECTED = pd.to_datetime(['1966-06-09', '2015-12-25', '1966-06-09', None, '1969-01-01',
+                           '2015-12-25', None, '1968-02-29'])
+
+
+def _check(dates, releases):
+    np.testing.assert_array_equal(dates.to_numpy(dtype='datetime64[ns]'), EXPECTED.to_numpy())
+    assert dates.index.equals(releases.index)
+    assert dates.name == 'release_date'
+
+
+def test_parse_release_dates(releases):
+    _check(parse_release_dates(releases), releases)
+
+
+def test_parse_release_dates_categorical(releases):
+    categorical = releases.astype({'release_date': 'category'})
+    _check(parse_release_dates(categorical), releases)
+
+
+def test_parse_dates_missing_values():
+    dates = parse_dates(pd.Series([np.nan, '6/9/15', None, '6/9/15']))
+    assert dates.isna().tolist() == [True, False, True, False]
+    assert dates.iloc[1] == dates.iloc[3] == pd.Timestamp('2015-06-09')
+
+
+def test_two_digit_pivot_without_year(releases):
+    # %y alone puts 00-68 in the 2000s
+    dates = parse_release_dates(releases.drop(columns='release_year'))
+    assert dates.iloc[0] == pd.Timestamp('2066-06-09')
+    assert dates.iloc[4] == pd.Timestamp('1969-01-01')
+
+
+def test_reconcile_century():
+    dates = pd.Series(pd.to_datetime(['2066-06-09', '2015-12-25', None, '2068-02-29', '2010-01-01']))
+    years = [1966, 2015, 1999, 1968, 2011]
+    fixed = reconcile_century(dates, years)
+    expected = pd.to_datetime(['1966-06-09', '2015-12-25', None, '1968-02-29', '2010-01-01'])
+    np.testing.assert_array_equal(fixed.to_numpy(dtype='datetime64[ns]'), expected.to_numpy())
+
+
+def test_reconcile_century_leaves_other_offsets():
+    dates = pd.Series(pd.to_datetime(['2015-12-25', None, '2014-03-01']))
+    pd.testing.assert_series_equal(reconcile_century(dates, [2015, 1980, 1964]), dates)
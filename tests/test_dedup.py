@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.helpers import split_rows
+from tmdb.dedup import DIGEST128, DigestSet, dedup_batch, row_digests
+
+
+@pytest.fixture
+def repeated(movies):
+    """The movies followed by 150 of them again, in another order."""
+    return pd.concat([movies, movies.sample(150, random_state=1)])
+
+
+@pytest.mark.parametrize('bits', [64, 128])
+def test_digest_set_matches_duplicated(repeated, movies, bits):
+    seen = DigestSet()
+    duplicate = []
+    for part in split_rows(repeated, 8):
+        digests = row_digests(part, bits=bits)
+        found = seen.contains(digests) | pd.DataFrame(digests).duplicated().to_numpy()
+        seen.add(digests)
+        duplicate.append(found)
+    np.testing.assert_array_equal(np.concatenate(duplicate), repeated.duplicated().to_numpy())
+    assert len(seen) == len(movies)
+
+
+def test_row_digests_128_extends_64(movies):
+    digests = row_digests(movies, bits=128)
+    assert digests.dtype == DIGEST128
+    np.testing.assert_array_equal(digests['high'], row_digests(movies))
+    assert (digests['high'] != digests['low']).all()
+
+
+def test_dedup_batch(tmp_path, repeated):
+    path = str(tmp_path / 'seen.npy')
+    kept = []
+    for part in split_rows(repeated, 5):
+        seen = DigestSet.load(path)
+        kept.append(dedup_batch(part, seen))
+        seen.save(path)
+    pd.testing.assert_frame_equal(pd.concat(kept), repeated.drop_duplicates())
+
+
+def test_digest_set_rejects_other_width(movies):
+    seen = DigestSet()
+    seen.add(row_digests(movies))
+    with pytest.raises(ValueError):
+        seen.contains(row_digests(movies, bits=128))
+
+
+@pytest.mark.parametrize('bits', [64, 128])
+def test_digest_set_save_load(tmp_path, movies, bits):
+    seen = DigestSet()
+    for part in split_rows(movies, 3):
+        seen.add(row_digests(part, bits=bits))
+    path = str(tmp_path / 'seen.npy')
+    seen.save(path)
+    loaded = DigestSet.load(path)
+    assert len(loaded) == len(movies)
+    assert loaded.contains(row_digests(movies, bits=bits)).all()
+    assert len(DigestSet.load(str(tmp_path / 'missing.npy'))) == 0
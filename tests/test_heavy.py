@@ -0,0 +1,31 @@
+from tests.helpers import exploded, merged, split_rows
+from tmdb.heavy import SpaceSaving
+
+
+def test_space_saving_exact_within_capacity(movies):
+    expected = exploded(movies, 'cast')['value'].value_counts()
+
+    def build(part):
+        summary = SpaceSaving(capacity=len(expected))
+        summary.update_strings(part['cast'])
+        return summary
+
+    summary = merged(split_rows(movies, 4), build)
+    assert summary.top().to_dict() == expected.to_dict()
+    assert summary.total == expected.sum()
+
+
+def test_space_saving_bounds_after_merge(movies):
+    expected = exploded(movies, 'cast')['value'].value_counts()
+
+    def build(part):
+        summary = SpaceSaving(capacity=20)
+        summary.update_strings(part['cast'])
+        return summary
+
+    summary = merged(split_rows(movies, 4), build)
+    found = summary.top_with_errors()
+    true = expected.reindex(found.index, fill_value=0)
+    assert (found['guaranteed'] <= true).all()
+    assert (true <= found['count']).all()
+    assert (found['error'] <= summary.error_bound).all()
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.helpers import exploded
+from tmdb.invindex import InvertedIndex
+
+
+@pytest.fixture
+def people():
+    return pd.DataFrame({'cast': [
+        'Zoë Kravitz|Tom Cruise',
+        'Tom Hanks|Penélope Cruz',
+        'Penélope Cruz|Tom Cruise|Zoë Kravitz',
+        None,
+        '渡辺謙|Tom Cruise',
+        'Tom Hanks',
+    ]})
+
+
+def _rows(frame, predicate):
+    return np.flatnonzero(frame['cast'].fillna('').str.split('|').apply(predicate).to_numpy())
+
+
+def test_vocabulary_is_sorted_bytes(people):
+    index = InvertedIndex.build(people, 'cast')
+    assert index.vocabulary.dtype.kind == 'S'
+    assert list(index.vocabulary) == sorted(index.vocabulary)
+    assert len(index) == 5 and index.rows == len(people)
+
+
+def test_lookup(people):
+    index = InvertedIndex.build(people, 'cast')
+    for name in ('Tom Cruise', 'Penélope Cruz', 'Zoë Kravitz', '渡辺謙'):
+        assert name in index
+        np.testing.assert_array_equal(index.lookup(name), _rows(people, lambda names: name in names))
+    assert 'Tom' not in index
+    assert len(index.lookup('Nobody')) == 0
+
+
+def test_prefix_and_terms(people):
+    index = InvertedIndex.build(people, 'cast')
+    assert index.terms('Tom ') == ['Tom Cruise', 'Tom Hanks']
+    assert index.terms('Pen') == ['Penélope Cruz']
+    assert index.terms('Zoë') == ['Zoë Kravitz']
+    assert index.terms('渡') == ['渡辺謙']
+    assert index.terms('Q') == []
+    np.testing.assert_array_equal(index.prefix('Tom'), _rows(people, lambda names: any(n.startswith('Tom') for n in names)))
+    assert len(index.prefix('Q')) == 0
+
+
+def test_all_of_and_any_of(people):
+    index = InvertedIndex.build(people, 'cast')
+    np.testing.assert_array_equal(index.all_of('Tom Cruise', 'Zoë Kravitz'), [0, 2])
+    np.testing.assert_array_equal(index.all_of('Tom Cruise', 'Nobody'), [])
+    np.testing.assert_array_equal(index.any_of('Tom Hanks', '渡辺謙'), [1, 4, 5])
+    assert len(index.all_of()) == 0 and len(index.any_of()) == 0
+    assert index.mask(index.lookup('Tom Hanks')).tolist() == [False, True, False, False, False, True]
+
+
+def test_matches_exploded_movies(movies):
+    index = InvertedIndex.build(movies, 'cast')
+    positions = exploded(movies.reset_index(drop=True), 'cast').groupby('value').groups
+    assert len(index) == len(positions)
+    for name, rows in positions.items():
+        np.testing.assert_array_equal(index.lookup(name), np.unique(rows))
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load(tmp_path, people, mmap):
+    index = InvertedIndex.build(people, 'cast')
+    index.save(str(tmp_path / 'cast'))
+    loaded = InvertedIndex.load(str(tmp_path / 'cast'), mmap=mmap)
+    assert isinstance(loaded.postings, np.memmap) == mmap
+    for name in ('vocabulary', 'offsets', 'postings'):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(index, name))
+    assert (loaded.rows, loaded.name) == (index.rows, index.name)
+    np.testing.assert_array_equal(loaded.all_of('Penélope Cruz', 'Tom Cruise'), [2])
+    assert loaded.terms('Zo') == ['Zoë Kravitz']
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.helpers import exploded
+from tmdb.parallel import MONEY_AND_RUNTIME, NUMERIC, run_questions
+
+THRESHOLD = 50_000_000
+
+
+def _check(results, frame):
+    extremes = results['extremes']
+    for column in MONEY_AND_RUNTIME:
+        assert extremes.loc[column, 'max'] == frame[column].max()
+        assert extremes.loc[column, 'min'] == frame[column].min()
+        assert extremes.loc[column, 'idxmax'] == frame[column].idxmax()
+        assert extremes.loc[column, 'idxmin'] == frame[column].idxmin()
+
+    by_year = frame.groupby('release_year')
+    for column in MONEY_AND_RUNTIME:
+        pd.testing.assert_series_equal(results['yearly'].sum(column), by_year[column].sum(),
+                                       check_names=False, check_dtype=False)
+
+    genre_years = exploded(frame, 'genres').groupby(['release_year', 'value']).size().unstack(fill_value=0)
+    table = results['genre_years'].table()
+    pd.testing.assert_frame_equal(table.loc[genre_years.index, genre_years.columns], genre_years,
+                                  check_names=False, check_dtype=False)
+
+    profitable = frame[frame['profit'] >= THRESHOLD]
+    answer = results['profitable']
+    assert answer['count'] == len(profitable)
+    for column, mean in answer['means'].items():
+        assert mean == pytest.approx(profitable[column].mean())
+    for column in ('genres', 'cast'):
+        expected = exploded(profitable, column)['value'].value_counts()
+        assert answer[column].to_dict() == expected.to_dict()
+        assert answer[column].is_monotonic_decreasing
+
+    pd.testing.assert_frame_equal(results['correlation'], frame[NUMERIC].corr(), atol=1e-9)
+
+    sketch = results['runtime']
+    runtime = frame['runtime']
+    assert sketch.count == runtime.count()
+    assert sketch.mean == pytest.approx(runtime.mean())
+    assert sketch.std == pytest.approx(runtime.std())
+    assert (sketch.min, sketch.max) == (runtime.min(), runtime.max())
+
+
+@pytest.mark.parametrize('by', ['rows', 'release_year'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_matches_pandas(movies, workers, by):
+    # profit is derived from revenue and budget, not read from the frame
+    base = movies.drop(columns='profit')
+    _check(run_questions(base, workers=workers, partitions=5, by=by, profit_threshold=THRESHOLD), movies)
+
+
+def test_partitionings_agree(movies):
+    serial = run_questions(movies, workers=1, profit_threshold=THRESHOLD)
+    pooled = run_questions(movies, workers=2, partitions=7, by='release_year', profit_threshold=THRESHOLD)
+    pd.testing.assert_frame_equal(serial['extremes'], pooled['extremes'])
+    pd.testing.assert_frame_equal(serial['genre_years'].table(), pooled['genre_years'].table())
+    pd.testing.assert_series_equal(serial['profitable']['cast'], pooled['profitable']['cast'])
+
+
+def test_empty_frame(movies):
+    results = run_questions(movies.iloc[:0], workers=2)
+    assert results['profitable']['count'] == 0
+    assert np.isnan(results['profitable']['means']['budget'])
+    assert results['extremes']['idxmax'].isna().all()
+
+
+def test_rejects_unknown_partitioning(movies):
+    with pytest.raises(ValueError):
+        run_questions(movies, workers=1, by='director')
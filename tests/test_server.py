@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from tmdb.dataset import MovieDataset
+from tmdb.server import QueryService, start_server
+
+
+async def _get(port, target, headers=''):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write('GET {} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n{}\r\n'.format(target, headers).encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+def _serve(frame, client):
+    """Run ``client(service, port)`` against a server over ``frame``."""
+    service = QueryService(MovieDataset(frame.drop(columns='profit')), workers=2)
+
+    async def main():
+        server = await start_server(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await client(service, port)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        service.close()
+
+
+def test_endpoints(movies):
+    async def client(service, port):
+        return {target: await _get(port, target) for target in (
+            '/health', '/extremes?column=budget', '/most-profitable-year', '/top-genres?k=3', '/movies?cast=Actor+1',
+        )}
+
+    answers = _serve(movies, client)
+    assert answers['/health'] == (200, {'status': 'ok', 'version': 0, 'rows': len(movies)})
+
+    status, extremes = answers['/extremes?column=budget']
+    assert status == 200
+    highest = extremes['budget']['highest']
+    assert highest['id'] == movies['budget'].idxmax()
+    assert highest['profit'] == movies.loc[highest['id'], 'profit']
+
+    profits = movies.groupby('release_year')['profit'].sum()
+    assert answers['/most-profitable-year'] == (200, {'year': int(profits.idxmax()), 'profit': int(profits.max())})
+
+    status, genres = answers['/top-genres?k=3']
+    assert status == 200 and len(genres) == 3
+
+    status, found = answers['/movies?cast=Actor+1']
+    expected = movies[movies['cast'].str.split('|').apply(lambda names: 'Actor 1' in names)]
+    assert status == 200
+    assert found['count'] == len(expected)
+    assert found['revenue'] == expected['revenue'].sum()
+
+
+@pytest.mark.parametrize('target, headers, status', [
+    ('/top-cast?k=-1', '', 400),
+    ('/movies', '', 400),
+    ('/extremes?column=title', '', 400),
+    ('/health', 'Content-Length: abc\r\n', 400),
+    ('/no-such-endpoint', '', 404),
+])
+def test_errors(movies, target, headers, status):
+    async def client(service, port):
+        return await _get(port, target, headers)
+
+    answer_status, answer = _serve(movies, client)
+    assert answer_status == status
+    assert 'error' in answer
+
+
+def test_version_bump_recomputes(movies):
+    async def client(service, port):
+        before = await _get(port, '/most-profitable-year')
+        cached = await _get(port, '/most-profitable-year')
+        hits = service._responses.info().hits
+        with service.movies.edit() as frame:
+            first = frame.index[0]
+            frame.loc[first, 'revenue'] = frame.loc[first, 'budget'] + 10 ** 15
+            frame.loc[first, 'release_year'] = 1900
+        after = await _get(port, '/most-profitable-year')
+        return before, cached, hits, after
+
+    before, cached, hits, after = _serve(movies, client)
+    assert cached == before
+    assert hits == 1
+    assert after == (200, {'year': 1900, 'profit': 10 ** 15})
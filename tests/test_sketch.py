@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from tests.helpers import merged, split_rows
+from tmdb.sketch import ColumnSketch
+
+
+def test_column_sketch(movies):
+    sketch = merged(split_rows(movies, 7), lambda part: ColumnSketch.of(part['runtime']))
+    runtime = movies['runtime']
+    described = sketch.describe()
+    for stat in ('count', 'mean', 'std', 'min', 'max'):
+        assert described[stat] == pytest.approx(runtime.describe()[stat])
+    # the quartiles are approximate: within one percent of the ranks
+    ranks = runtime.rank(pct=True)
+    for q in (0.25, 0.5, 0.75):
+        nearest = (runtime - sketch.quantile(q)).abs().idxmin()
+        assert abs(ranks[nearest] - q) < 0.01
+
+
+def test_column_sketch_keeps_tails_exact():
+    values = np.random.default_rng(3).lognormal(4, 1, 200_000)
+    sketch = merged(np.array_split(values, 9), ColumnSketch.of)
+    ordered = np.sort(values)
+    # singleton centroids sit at their mid-rank
+    for i in (0, 4, 50):
+        assert sketch.quantile((i + 0.5) / len(values)) == pytest.approx(ordered[i])
+        assert sketch.quantile(1 - (i + 0.5) / len(values)) == pytest.approx(ordered[-1 - i])
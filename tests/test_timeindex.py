@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tmdb.timeindex import TimeIndex
+
+
+@pytest.fixture
+def dated(movies):
+    days = np.random.default_rng(3).integers(0, 365, len(movies))
+    dates = pd.to_datetime(movies['release_year'].astype(str) + '-01-01') + pd.to_timedelta(days, unit='D')
+    years = movies['release_year']
+    # a missing date in the first and in the last year
+    dates[years.idxmin()] = dates[years.idxmax()] = pd.NaT
+    return movies.assign(release_date=dates)
+
+
+def _expected(frame, column, start=None, end=None):
+    # a missing date orders after every date of its year
+    year_ends = pd.to_datetime(frame['release_year'].astype(str) + '-12-31 23:59:59')
+    dates = frame['release_date'].fillna(year_ends)
+    keep = pd.Series(True, index=frame.index)
+    if start is not None:
+        keep &= dates >= pd.Timestamp(start)
+    if end is not None:
+        keep &= dates <= pd.Timestamp(end)
+    return np.sort(frame.loc[keep, column].to_numpy())
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2001-03-01', '2007-08-31'), ('2001-03-01', None), (None, '2007-08-31'), (None, None), ('2010-01-01', '2001-01-01'),
+])
+def test_values(dated, start, end):
+    index = TimeIndex.build(dated)
+    values = index.values('budget', start, end)
+    if start is None and end is None:
+        assert len(values) == len(dated)
+    else:
+        np.testing.assert_array_equal(np.sort(values), _expected(dated, 'budget', start, end))
+
+
+def test_values_open_ends_keep_missing_dates(dated):
+    # NaT sorts last within its year, so it is only reachable through an open end
+    index = TimeIndex.build(dated)
+    lowest, highest = dated['release_year'].min(), dated['release_year'].max()
+    assert len(index.values('budget', start='{}-01-01'.format(lowest))) == len(dated)
+    assert len(index.values('budget', end='{}-12-31'.format(highest))) == len(dated) - 1
+
+
+def test_empty_frame(dated):
+    index = TimeIndex.build(dated.iloc[:0])
+    assert len(index.values('budget')) == 0
+    assert len(index.values('budget', start='2000-01-01')) == 0
+    assert len(index.values('budget', end='2000-01-01')) == 0
+    assert len(index.between('2000-01-01', '2010-01-01')) == 0
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from tmdb.tokens import tokenize
+
+
+@pytest.mark.parametrize('rows', [
+    np.array([5, 0, 3, 3, 599]),
+    np.arange(600) % 7 == 0,
+    np.array([], dtype=np.int64),
+])
+def test_tokens_take(movies, rows):
+    tokens = tokenize(movies['cast'])
+    taken = tokens.take(rows)
+    expected = movies['cast'].iloc[np.flatnonzero(rows) if rows.dtype == bool else rows]
+    assert len(taken) == len(expected)
+    assert list(taken.index) == list(expected.index)
+    exploded_taken = taken.explode()
+    assert list(exploded_taken) == [name for cell in expected for name in cell.split('|')]
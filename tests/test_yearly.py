@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from tests.helpers import merged, split_rows
+from tmdb.yearly import YearlyAggregates
+
+COLUMNS = ['budget', 'revenue', 'profit', 'runtime']
+
+
+def test_yearly_aggregates(movies):
+    yearly = merged(split_rows(movies, 4), lambda part: YearlyAggregates.build(part, COLUMNS))
+    by_year = movies.groupby('release_year')
+    for column in COLUMNS:
+        for stat in ('count', 'sum', 'min', 'max', 'mean', 'std'):
+            expected = getattr(by_year[column], stat)()
+            actual = getattr(yearly, stat)(column)
+            pd.testing.assert_series_equal(actual, expected, check_names=False, check_dtype=False)
+
+
+def test_yearly_aggregates_keep_integer_sums(movies):
+    yearly = merged(split_rows(movies, 3), lambda part: YearlyAggregates.build(part, COLUMNS))
+    assert yearly.sum('profit').dtype == np.int64
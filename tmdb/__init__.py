@@ -0,0 +1,5 @@
+"""Helpers for the TMDb movies analysis in ``Investigate_a_Dataset.py``."""
+
+from tmdb.loader import load_movies
+
+__all__ = ['load_movies']
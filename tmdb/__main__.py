@@ -0,0 +1,54 @@
+"""Command line entry point: ``python -m tmdb report|serve ...``."""
+
+import argparse
+import sys
+
+
+def _report(args):
+    from tmdb.report import run_report
+
+    written = run_report(
+        args.csv,
+        args.out,
+        figures=not args.no_figures,
+        formats=tuple(args.format),
+        cached=not args.no_cache,
+        workers=args.workers,
+    )
+    print('wrote {} files to {}'.format(len(written), args.out))
+
+
+def _serve(args):
+    from tmdb.server import serve
+
+    serve(args.csv, args.host, args.port, workers=args.workers, cached=not args.no_cache)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tmdb', description='TMDb movies analysis.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    report = commands.add_parser('report', help='run the wrangling and research questions headlessly')
+    report.add_argument('--csv', default='tmdb-movies.csv', help='path to tmdb-movies.csv')
+    report.add_argument('--out', default='report', help='output directory')
+    report.add_argument('--format', nargs='+', choices=['json', 'parquet'], default=['json'],
+                        help='table formats to write')
+    report.add_argument('--no-figures', action='store_true', help='skip rendering figures')
+    report.add_argument('--no-cache', action='store_true', help='always parse the CSV')
+    report.add_argument('--workers', type=int, help='processes used to render figures (default: one per core)')
+    report.set_defaults(run=_report)
+
+    server = commands.add_parser('serve', help='answer the research questions over HTTP as JSON')
+    server.add_argument('--csv', default='tmdb-movies.csv', help='path to tmdb-movies.csv')
+    server.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    server.add_argument('--port', type=int, default=8000, help='port to listen on (0 picks a free one)')
+    server.add_argument('--workers', type=int, default=4, help='threads computing answers')
+    server.add_argument('--no-cache', action='store_true', help='always parse the CSV')
+    server.set_defaults(run=_serve)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
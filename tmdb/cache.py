@@ -0,0 +1,131 @@
+"""Columnar cache of the cleaned movies frame.
+
+The cleaned frame is stored as an Arrow IPC file and memory-mapped when
+read back, so a warm start skips CSV parsing and cleaning entirely.  Plain
+numeric columns are zero-copy, read-only views of the mapped file (copy
+the frame before editing values in place); text columns come back with
+pandas' string dtype.  A cold start returns the frame as read back from the
+new file, so first and later runs see the same dtypes.  The
+cache key combines a SHA-256 of the source CSV with a hash of the cleaning
+configuration: editing the CSV or the config produces a new key and the
+cache is rebuilt on the next call.  File names start with ``source_id`` of
+the CSV path, so when a new version replaces a stale one only that path's
+files are removed and caches of other CSVs are kept.
+
+pyarrow is only needed when the cache is used.
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+from tmdb.cleaning import CLEANING_CONFIG, load_clean_movies
+
+CACHE_DIR = '.tmdb_cache'
+
+_HASH_BLOCK = 1 << 20
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as exc:
+        raise ImportError('the cleaned-data cache needs pyarrow: pip install pyarrow') from exc
+    return pyarrow
+
+
+def source_id(path):
+    """Short hash of the absolute ``path``, prefixing its cache files."""
+    return hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+
+
+def stale_entries(pattern, current):
+    """Paths matching the glob ``pattern`` other than ``current``."""
+    return [entry for entry in glob.glob(pattern) if entry != current]
+
+
+def source_hash(path, cache_dir=CACHE_DIR):
+    """SHA-256 of the file at ``path``.
+
+    The digest is remembered next to the cache together with the file's size
+    and modification time, so an unchanged file is not re-read on every run.
+    """
+    stat = os.stat(path)
+    stamp = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    stamp_path = os.path.join(cache_dir, 'source-{}.json'.format(source_id(path)))
+
+    try:
+        with open(stamp_path) as f:
+            saved = json.load(f)
+        if all(saved.get(name) == value for name, value in stamp.items()):
+            return saved['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+    stamp['sha256'] = digest.hexdigest()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(stamp_path, 'w') as f:
+        json.dump(stamp, f)
+    return stamp['sha256']
+
+
+def cache_key(path, config=CLEANING_CONFIG, cache_dir=CACHE_DIR):
+    """Key identifying the cleaned frame for ``path`` under ``config``."""
+    digest = hashlib.sha256(source_hash(path, cache_dir).encode())
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:24]
+
+
+def write_cache(df, cache_path):
+    """Write ``df`` (including its index) to ``cache_path`` as Arrow IPC."""
+    pa = _require_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    tmp_path = cache_path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    # readers never see a half-written file
+    os.replace(tmp_path, cache_path)
+
+
+def read_cache(cache_path):
+    """Memory-map the Arrow IPC file at ``cache_path`` into a DataFrame.
+
+    Columns are not consolidated into 2-D blocks, so numeric ones stay views
+    of the mapping; the Arrow buffers of converted columns are released.
+    """
+    pa = _require_pyarrow()
+    with pa.memory_map(cache_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def cached_clean_movies(path='tmdb-movies.csv', config=CLEANING_CONFIG, cache_dir=CACHE_DIR, refresh=False):
+    """Return the cleaned frame for ``path``, building the cache if needed.
+
+    Pass ``refresh=True`` to rebuild the cache even when it is current.
+    Cache files for other versions of the same source or of the config are
+    removed when a new one is written.
+    """
+    source = source_id(path)
+    key = cache_key(path, config, cache_dir)
+    cache_path = os.path.join(cache_dir, 'movies-{}-{}.arrow'.format(source, key))
+
+    if not refresh and os.path.exists(cache_path):
+        return read_cache(cache_path)
+
+    df = load_clean_movies(path, config)
+    os.makedirs(cache_dir, exist_ok=True)
+    write_cache(df, cache_path)
+
+    for stale in stale_entries(os.path.join(cache_dir, 'movies-{}-*.arrow'.format(source)), cache_path):
+        os.remove(stale)
+    # read back, so a miss hands out the same dtypes as every later hit
+    return read_cache(cache_path)
@@ -0,0 +1,71 @@
+"""The notebook's data cleaning chain as a single function."""
+
+import numpy as np
+
+from tmdb.dedup import drop_duplicates
+from tmdb.loader import RELEASE_DATE_FORMAT, USECOLS, load_movies
+
+# Everything that decides what the cleaned frame looks like.  It is part of
+# the cache key in tmdb.cache, so bump ``version`` whenever clean_movies
+# changes behaviour without a config change.
+CLEANING_CONFIG = {
+    'version': 3,
+    'usecols': USECOLS,
+    'release_date_format': RELEASE_DATE_FORMAT,
+    # rows are duplicates when these columns match; None compares whole rows
+    'duplicate_subset': None,
+    # zeros in these columns mean "unknown"
+    'zero_as_missing': ['runtime', 'budget', 'revenue'],
+    # rows where any of these is unknown are removed
+    'required': ['budget', 'revenue'],
+    # dtypes after cleaning; unknown values of nullable dtypes become <NA>
+    'dtypes': {'budget': 'int64', 'revenue': 'int64', 'runtime': 'Int32'},
+}
+
+
+def clean_movies(df, config=CLEANING_CONFIG):
+    """Apply the notebook's cleaning steps to a frame from ``load_movies``.
+
+    Duplicates (on ``config['duplicate_subset']``) are removed, then
+    ``clean_values`` is applied.
+    """
+    return clean_values(drop_duplicates(df, config['duplicate_subset']), config)
+
+
+def clean_values(df, config=CLEANING_CONFIG):
+    """The row-local cleaning steps, safe to apply chunk by chunk.
+
+    Rows with a zero or missing ``required`` value are dropped and columns
+    are cast to ``dtypes``; other ``zero_as_missing`` columns keep their
+    rows with the zeros turned into missing values.
+
+    This replaces the notebook's ``replace(0, NaN)`` / ``dropna`` /
+    ``applymap(np.int64)`` chain: one boolean mask is built over the raw
+    arrays, the frame is filtered once and cast with ``astype``.
+    """
+    required = list(config['required'])
+
+    keep = np.ones(len(df), dtype=bool)
+    for column in required:
+        values = df[column].to_numpy()
+        keep &= values != 0
+        if values.dtype.kind == 'f':
+            keep &= ~np.isnan(values)
+
+    df = df[keep].astype(config['dtypes'])
+
+    for column in config['zero_as_missing']:
+        if column not in required:
+            df[column] = _zero_as_missing(df[column])
+
+    return df
+
+
+def _zero_as_missing(values):
+    zeros = (values == 0).fillna(False).to_numpy(dtype=bool)
+    return values.mask(zeros) if zeros.any() else values
+
+
+def load_clean_movies(path='tmdb-movies.csv', config=CLEANING_CONFIG):
+    """Load ``path`` and return the cleaned frame."""
+    return clean_movies(load_movies(path, usecols=config['usecols']), config)
@@ -0,0 +1,39 @@
+"""Column-to-array conversions shared by the aggregation modules.
+
+Every reduction in the package reads columns as plain numpy arrays with
+NaN for missing values, whether ``data`` is a DataFrame or a mapping of
+column name to array:
+
+* ``float_column``: one column as float64;
+* ``float_block``: several columns as one Fortran-ordered float64 block;
+* ``column_values``: int64 for plain integer columns (exact sums), float64
+  otherwise.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def float_column(values):
+    """``values`` (Series or array) as float64, NaN for missing."""
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype='float64', na_value=np.nan)
+    return np.asarray(values, dtype='float64')
+
+
+def float_block(data, columns):
+    """Fortran-ordered (rows x columns) float64 block with NaN for missing."""
+    first = float_column(data[columns[0]])
+    block = np.empty((len(first), len(columns)), dtype='float64', order='F')
+    block[:, 0] = first
+    for j, column in enumerate(columns[1:], start=1):
+        block[:, j] = float_column(data[column])
+    return block
+
+
+def column_values(values):
+    """int64 array for plain integer columns, float64 with NaN otherwise."""
+    dtype = getattr(values, 'dtype', None)
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        return np.asarray(values, dtype=np.int64)
+    return float_column(values)
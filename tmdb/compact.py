@@ -0,0 +1,81 @@
+"""Compact column types for the cleaned movies frame.
+
+After cleaning, most of the frame's memory is Python string objects: every
+title, cast list, director, tagline and genre list is a separate ``str``
+with its own header, referenced from an object array.  ``compact_movies``
+
+* dictionary-encodes low-cardinality text (``director``, ``genres``) as
+  categoricals, so each distinct value is stored once,
+* stores the remaining free text as Arrow strings (one contiguous buffer
+  plus offsets), and
+* downcasts integer columns to the smallest type that holds their range;
+  nullable integers stay nullable.
+
+``memory_report`` compares ``memory_usage(deep=True)`` before and after.
+
+pyarrow is only needed for the Arrow strings.
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ['director', 'genres']
+TEXT = ['original_title', 'cast', 'tagline']
+DOWNCAST = ['runtime', 'release_year']
+
+_INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _arrow_string_dtype():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise ImportError('Arrow-backed strings need pyarrow: pip install pyarrow') from exc
+    return pd.StringDtype('pyarrow')
+
+
+def smallest_integer_dtype(values):
+    """Smallest integer dtype holding every value of ``values``.
+
+    Nullable (``Int*``) columns get the nullable dtype of that size.
+    """
+    nullable = isinstance(values.dtype, pd.api.extensions.ExtensionDtype)
+    low, high = values.min(), values.max()
+    if pd.isna(low):
+        low = high = 0
+    for candidate in _INTEGER_TYPES:
+        info = np.iinfo(candidate)
+        if info.min <= low and high <= info.max:
+            dtype = np.dtype(candidate)
+            break
+    return 'I' + dtype.name[1:] if nullable else dtype
+
+
+def compact_movies(df, categories=CATEGORIES, text=TEXT, downcast=DOWNCAST):
+    """Return ``df`` with compact dtypes; columns it lacks are skipped."""
+    dtypes = {}
+    for column in categories:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            dtypes[column] = 'category'
+    if any(column in df for column in text):
+        string = _arrow_string_dtype()
+        for column in text:
+            if column in df and df[column].dtype != string:
+                dtypes[column] = string
+    for column in downcast:
+        if column in df and df[column].dtype.kind in 'iu':
+            dtypes[column] = smallest_integer_dtype(df[column])
+    return df.astype(dtypes) if dtypes else df
+
+
+def memory_report(before, after):
+    """Deep memory usage per column of two versions of a frame, in bytes."""
+    report = pd.DataFrame({
+        'before': before.memory_usage(deep=True),
+        'after': after.memory_usage(deep=True),
+    })
+    report.loc['total'] = report.sum()
+    report['ratio'] = report['before'] / report['after']
+    report['dtype_before'] = before.dtypes.astype(str)
+    report['dtype_after'] = after.dtypes.astype(str)
+    return report
@@ -0,0 +1,144 @@
+"""Chunked, mergeable correlation matrices with pairwise-complete rows.
+
+``CorrelationAccumulator`` keeps, for every pair of columns (i, j) and
+over the rows where both are present, the count n and the sums of x_i,
+x_i**2 and x_i*x_j.  These sufficient statistics are added chunk by chunk
+(each chunk is a few matrix products) and merged across worker partitions,
+so the data never has to be in memory at once.  Missing values only drop
+the pairs they take part in, which is what ``DataFrame.corr`` does and
+what ``np.corrcoef`` does not.
+
+Values are shifted by a per-column offset (the first chunk's means) before
+summing, to avoid the cancellation that raw sums of money values suffer.
+
+``method='spearman'`` correlates approximate ranks: every value is
+replaced by its bin among ``n_bins`` quantile edges taken from the first
+chunk (or passed in).  Accumulators only merge when they share edges, so
+partitions should be given the same ``edges``, e.g. from
+``quantile_edges`` on a sample.
+"""
+
+import numpy as np
+import pandas as pd
+
+from tmdb.columns import float_block
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def quantile_edges(data, columns, n_bins=1024):
+    """Per-column quantile bin edges for approximate Spearman ranks."""
+    block = float_block(data, list(columns))
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    return [np.unique(np.nanquantile(block[:, j], quantiles)) if not np.isnan(block[:, j]).all()
+            else np.empty(0) for j in range(block.shape[1])]
+
+
+class CorrelationAccumulator:
+    """Sufficient statistics for the correlation matrix of ``columns``."""
+
+    def __init__(self, columns, method='pearson', n_bins=1024, edges=None, shift=None):
+        if method not in ('pearson', 'spearman'):
+            raise ValueError("method must be 'pearson' or 'spearman', got {!r}".format(method))
+        self.columns = list(columns)
+        self.method = method
+        self.n_bins = n_bins
+        self.edges = edges
+        self.shift = None if shift is None else np.asarray(shift, dtype='float64')
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def _ranks(self, data, block):
+        if self.edges is None:
+            self.edges = quantile_edges(data, self.columns, self.n_bins)
+        ranks = np.empty_like(block)
+        for j, edges in enumerate(self.edges):
+            ranks[:, j] = np.searchsorted(edges, block[:, j], side='right')
+        ranks[np.isnan(block)] = np.nan
+        return ranks
+
+    def update(self, data):
+        """Add the rows of ``data`` (DataFrame or mapping of column arrays)."""
+        block = float_block(data, self.columns)
+        if not len(block):
+            return
+        if self.method == 'spearman':
+            block = self._ranks(data, block)
+
+        present = ~np.isnan(block)
+        if self.shift is None:
+            with np.errstate(invalid='ignore'):
+                self.shift = np.nan_to_num(np.nanmean(np.where(present, block, np.nan), axis=0))
+
+        centred = np.where(present, block - self.shift, 0.0)
+        weights = present.astype('float64')
+        self.n += weights.T @ weights
+        self.sx += centred.T @ weights
+        self.sxx += (centred * centred).T @ weights
+        self.sxy += centred.T @ centred
+
+    def _reshifted(self, shift):
+        """(sx, sxx, sxy) as if the values had been shifted by ``shift``."""
+        d = shift - self.shift
+        sx = self.sx - self.n * d[:, None]
+        sxx = self.sxx - 2 * d[:, None] * self.sx + self.n * (d ** 2)[:, None]
+        sxy = (self.sxy - d[None, :] * self.sx - d[:, None] * self.sx.T
+               + self.n * np.outer(d, d))
+        return sx, sxx, sxy
+
+    def merge(self, other):
+        """Add the statistics of ``other``, e.g. from another partition."""
+        if other.columns != self.columns or other.method != self.method:
+            raise ValueError('cannot merge accumulators of different columns or methods')
+        if other.shift is None:
+            return
+        if self.method == 'spearman' and self.edges is not None and not all(
+                np.array_equal(a, b) for a, b in zip(self.edges, other.edges)):
+            raise ValueError('spearman accumulators need the same edges to merge')
+        if self.shift is None:
+            self.shift = other.shift
+            self.edges = other.edges
+        sx, sxx, sxy = other._reshifted(self.shift)
+        self.n += other.n
+        self.sx += sx
+        self.sxx += sxx
+        self.sxy += sxy
+
+    def correlation(self):
+        """Correlation matrix as a DataFrame; NaN where a pair has < 2 rows or no variance."""
+        n, sx, sxx = self.n, self.sx, self.sxx
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = n * self.sxy - sx * sx.T
+            variance_x = n * sxx - sx ** 2
+            variance_y = variance_x.T
+            corr = covariance / np.sqrt(variance_x * variance_y)
+        corr[(n < 2) | (variance_x <= 0) | (variance_y <= 0)] = np.nan
+        corr = np.clip(corr, -1, 1)
+        np.fill_diagonal(corr, np.where(np.isnan(np.diag(corr)), np.nan, 1.0))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def correlation(data, columns=None, method='pearson', chunksize=DEFAULT_CHUNKSIZE):
+    """Correlation matrix of ``data``, ``chunksize`` rows at a time.
+
+    ``columns`` defaults to the numeric columns of a DataFrame.
+    """
+    if columns is None:
+        columns = list(data.select_dtypes('number').columns)
+    accumulator = CorrelationAccumulator(columns, method)
+    rows = len(data[columns[0]])
+    for start in range(0, rows, chunksize):
+        if isinstance(data, pd.DataFrame):
+            chunk = data.iloc[start:start + chunksize]
+        else:
+            chunk = {column: data[column][start:start + chunksize] for column in columns}
+        accumulator.update(chunk)
+    return accumulator.correlation()
+
+
+def pair_correlation(data, x, y, method='pearson'):
+    """Correlation of columns ``x`` and ``y`` over the rows where both are present."""
+    return correlation(data, [x, y], method).loc[x, y]
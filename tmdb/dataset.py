@@ -0,0 +1,291 @@
+"""The notebook's analysis functions on an explicit, versioned dataset.
+
+``calculate``, ``data``, ``profit_avg`` and ``avg_fun`` in the notebook are
+plain functions over the global ``df``/``profit_data``.  ``MovieDataset``
+holds the cleaned frame with a version stamp and memoizes those functions
+in a bounded LRU cache keyed by (function, arguments, version), so
+``cache_info`` counts only the analyses.  The structures they share
+(``derived``, ``segments``, ``profitable`` and the inverted indexes) are
+plain attributes built once per version instead, so the LRU cannot evict
+them.  Replacing or editing the frame bumps the version and drops every
+cached result and helper.
+
+``profit`` is not stored in the frame: ``derived()`` computes it from
+``revenue`` and ``budget`` when it is first read, and ``rows`` adds it to
+the movies it returns.
+
+Cached results are returned as-is, like ``functools.lru_cache``; copy them
+before modifying them in place.
+"""
+
+import functools
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+from tmdb.crosstab import YearGenreCounts
+from tmdb.derived import DerivedColumns
+from tmdb.extremes import extremes
+from tmdb.heavy import SpaceSaving
+from tmdb.invindex import InvertedIndex
+from tmdb.segments import Segments
+from tmdb.yearly import YearlyAggregates
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+PROFIT_THRESHOLD = 50_000_000
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry.
+
+    Lookups and insertions are thread-safe; ``compute`` runs outside the
+    lock, so two threads missing the same key may both compute it.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Return the value cached under ``key``, calling ``compute`` on a miss."""
+        try:
+            return self.lookup(key)
+        except KeyError:
+            pass
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def lookup(self, key):
+        """Return the value cached under ``key``; ``KeyError`` on a miss."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Cache ``value`` under ``key``, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+def _hashable(value):
+    # lists of columns are accepted everywhere else, so accept them here too
+    return tuple(value) if isinstance(value, list) else value
+
+
+def memoized(method):
+    """Cache ``method`` in the dataset's LRU, keyed on the dataset version.
+
+    List arguments are passed on (and keyed) as tuples.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        args = tuple(_hashable(value) for value in args)
+        kwargs = {name: _hashable(value) for name, value in kwargs.items()}
+        key = (method.__name__, args, tuple(sorted(kwargs.items())), self.version)
+        return self._cache.get(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+class MovieDataset:
+    """Cleaned movies frame plus cached analyses; ``profit`` is a derived column."""
+
+    def __init__(self, frame, profit_threshold=PROFIT_THRESHOLD, cache_size=128):
+        self._frame = frame
+        # frames read from the cache hold read-only views of the cache file
+        self._writable = True
+        self.profit_threshold = profit_threshold
+        self.version = 0
+        self._cache = LRUCache(cache_size)
+        self._reset()
+
+    def _reset(self):
+        # per-version helpers shared by the analyses
+        self._derived = None
+        self._segments = None
+        self._profitable = None
+        self._indexes = {}
+
+    @classmethod
+    def load(cls, path='tmdb-movies.csv', cached=True, compact=False, **kwargs):
+        """Load and clean ``path`` (through the Arrow cache unless ``cached=False``).
+
+        ``compact=True`` converts the frame with ``tmdb.compact.compact_movies``.
+        """
+        if cached:
+            from tmdb.cache import cached_clean_movies
+            frame = cached_clean_movies(path)
+        else:
+            from tmdb.cleaning import load_clean_movies
+            frame = load_clean_movies(path)
+        if compact:
+            from tmdb.compact import compact_movies
+            frame = compact_movies(frame)
+        movies = cls(frame, **kwargs)
+        movies._writable = not cached
+        return movies
+
+    @property
+    def frame(self):
+        return self._frame
+
+    def replace(self, frame):
+        """Swap in a new frame."""
+        self._frame = frame
+        self._writable = True
+        self.changed()
+
+    @contextmanager
+    def edit(self):
+        """Modify the frame in place; cached results are dropped afterwards.
+
+        A frame loaded from the cache is copied first, as its numeric
+        columns are read-only views of the cache file.
+        """
+        if not self._writable:
+            self._frame = self._frame.copy()
+            self._writable = True
+        try:
+            yield self._frame
+        finally:
+            self.changed()
+
+    def changed(self):
+        """Record that the frame changed: bump the version, drop the cache."""
+        self.version += 1
+        self._cache.clear()
+        self._reset()
+
+    def cache_info(self):
+        """Hit/miss counters of the result cache, as a ``CacheInfo``."""
+        return self._cache.info()
+
+    def rows(self, positions):
+        """The movies at ``positions`` (a copy), with ``profit`` after ``revenue``."""
+        rows = self._frame.iloc[positions]
+        if 'profit' not in rows:
+            profit = self.derived()['profit'][np.asarray(positions, dtype=np.intp)]
+            rows.insert(rows.columns.get_loc('revenue') + 1, 'profit', profit)
+        return rows
+
+    @memoized
+    def extremes(self, columns):
+        """``tmdb.extremes.extremes`` over a tuple of (possibly derived) columns."""
+        return extremes(self.derived(), list(columns))
+
+    @memoized
+    def calculate(self, column):
+        """Highest and lowest rows for ``column``, side by side."""
+        return self.rows(list(self.extremes((column,)).positions(column))).T
+
+    def derived(self):
+        """``tmdb.derived.DerivedColumns`` over the current frame.
+
+        Computed columns are cached until the frame changes.
+        """
+        if self._derived is None:
+            self._derived = DerivedColumns(self._frame)
+        return self._derived
+
+    def segments(self):
+        """``tmdb.segments.Segments`` factory over the current frame.
+
+        Its arrays and tokenized columns are kept until the frame changes.
+        """
+        if self._segments is None:
+            self._segments = Segments(self._frame, self.derived())
+        return self._segments
+
+    def inverted_index(self, column):
+        """``tmdb.invindex.InvertedIndex`` of the '|'-separated ``column``."""
+        if column not in self._indexes:
+            self._indexes[column] = InvertedIndex.from_tokens(self.segments().tokens(column))
+        return self._indexes[column]
+
+    def incidence(self, column):
+        """``tmdb.incidence.Incidence`` of the '|'-separated ``column``.
+
+        Per-token totals, means and yearly counts as sparse products, e.g.
+        ``incidence('genres').mean_by('revenue', mask=profitable())``.
+        """
+        return self.segments().incidence(column)
+
+    def profitable(self):
+        """Segment of the movies with a profit of at least ``profit_threshold``."""
+        if self._profitable is None:
+            self._profitable = self.segments().between('profit', self.profit_threshold)
+        return self._profitable
+
+    @memoized
+    def profit_data(self):
+        """Movies with a profit of at least ``profit_threshold``, indexed from 1.
+
+        This copies the rows; ``profitable`` answers the questions without one.
+        """
+        profit_data = self.rows(self.profitable().positions)
+        profit_data.index = range(1, len(profit_data) + 1)
+        return profit_data
+
+    @memoized
+    def data(self, column, approximate=False, capacity=1000, chunksize=100_000):
+        """Counts of the '|'-separated values of ``column`` among profitable movies.
+
+        With ``approximate=True`` the profitable rows are streamed
+        ``chunksize`` at a time into a ``tmdb.heavy.SpaceSaving`` summary of
+        ``capacity`` counters, so no per-name table of the whole column is
+        built; use its ``top_with_errors`` for the error bounds.
+        """
+        profitable = self.profitable()
+        if not approximate:
+            return profitable.token_counts(column)
+        positions = profitable.positions
+        values = self._frame[column]
+        summary = SpaceSaving(capacity)
+        for start in range(0, len(positions), chunksize):
+            summary.update_strings(values.iloc[positions[start:start + chunksize]])
+        return summary.top()
+
+    @memoized
+    def profit_avg(self, column):
+        """Mean of ``column`` among profitable movies."""
+        return self.profitable().mean(column)
+
+    @memoized
+    def yearly(self, columns):
+        """``tmdb.yearly.YearlyAggregates`` of a tuple of (possibly derived) columns."""
+        return YearlyAggregates.build(self.derived(), list(columns))
+
+    @memoized
+    def genre_counts(self):
+        """``tmdb.crosstab.YearGenreCounts`` of the frame."""
+        return YearGenreCounts.from_frame(self._frame)
+
+    @memoized
+    def avg(self, column):
+        """Mean of ``column`` over all movies."""
+        return self._frame[column].mean()
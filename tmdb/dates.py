@@ -0,0 +1,68 @@
+"""Parsing of TMDb's two-digit-year release dates.
+
+``release_date`` is stored as ``m/d/yy``.  Parsing it without a format makes
+pandas guess, and any ``%y`` parse puts years 00-68 in the 2000s, so a film
+from 1966 comes out as released in 2066.  ``parse_release_dates`` therefore
+
+* parses with an explicit format,
+* parses each distinct string once -- many movies share a release date, so
+  the categories of a categorical column (or the uniques of any other) are
+  parsed and the codes select from them, and
+* moves each date into the century of the row's ``release_year``.
+"""
+
+import numpy as np
+import pandas as pd
+
+# TMDb stores release dates as m/d/yy, e.g. 6/9/15.
+RELEASE_DATE_FORMAT = '%m/%d/%y'
+
+
+def parse_dates(values, format=RELEASE_DATE_FORMAT):
+    """Parse ``values`` with ``format``, parsing every distinct string once."""
+    index = getattr(values, 'index', None)
+    values = pd.Series(values, index=index, copy=False)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Index(uniques, dtype=object), format=format, errors='coerce')
+    parsed = parsed.to_numpy(dtype='datetime64[ns]')
+    dates = np.append(parsed, np.datetime64('NaT', 'ns'))[codes]  # code -1 -> NaT
+    return pd.Series(dates, index=values.index, name=values.name)
+
+
+def reconcile_century(dates, years):
+    """Shift ``dates`` by whole centuries so they fall in ``years``.
+
+    Rows whose date is missing, or whose year is off by anything other than
+    a multiple of 100, are left unchanged.
+    """
+    dates = pd.Series(dates, copy=False)
+    years = np.asarray(years, dtype=np.int64)
+    parsed = dates.dt.year.to_numpy(dtype='float64', na_value=np.nan)
+    with np.errstate(invalid='ignore'):
+        offset = years - parsed
+        wrong = (offset != 0) & (offset % 100 == 0)
+    if not wrong.any():
+        return dates
+    shifted = dates[wrong]
+    fixed = pd.to_datetime(
+        {'year': years[wrong], 'month': shifted.dt.month, 'day': shifted.dt.day},
+        errors='coerce',
+    ).to_numpy(dtype='datetime64[ns]')
+    values = dates.to_numpy(dtype='datetime64[ns]', copy=True)
+    values[wrong] = fixed
+    return pd.Series(values, index=dates.index, name=dates.name)
+
+
+def parse_release_dates(df, date='release_date', year='release_year', format=RELEASE_DATE_FORMAT):
+    """``df[date]`` parsed with ``format`` and put in the century of ``df[year]``.
+
+    Without a ``year`` column the two-digit-year pivot of ``format`` stands.
+    """
+    dates = parse_dates(df[date], format)
+    if year in df:
+        dates = reconcile_century(dates, df[year])
+    return dates
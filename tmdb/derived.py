@@ -0,0 +1,127 @@
+"""Derived columns declared as expressions over base columns.
+
+``profit``, ``roi`` and the like are functions of ``budget`` and
+``revenue``.  Storing each one with ``df.insert``/``df[...] = ...`` allocates
+a full column inside the frame every time it is (re)computed.  Here each is
+declared once as an expression in ``DEFINITIONS`` and ``DerivedColumns``
+evaluates it the first time it is read, with numexpr when it is installed
+and plain numpy otherwise, then caches the array until ``invalidate``.
+
+``DerivedColumns`` is a read-only mapping of column name to array that also
+serves the frame's own columns and carries its ``index``, so it can be
+passed wherever a frame is read column by column: ``tmdb.extremes``,
+``tmdb.yearly``, ``tmdb.correlation`` and ``tmdb.segments``.
+
+Expressions may use other derived columns.  The inflation-adjusted ones
+need ``budget_adj``/``revenue_adj``, which ``load_movies`` only reads when
+they are in ``usecols``.
+"""
+
+import ast
+from collections.abc import Mapping
+
+import numpy as np
+from pandas.api.types import is_numeric_dtype
+
+from tmdb.columns import column_values
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+DEFINITIONS = {
+    'profit': 'revenue - budget',
+    'roi': 'profit / budget',
+    'revenue_multiple': 'revenue / budget',
+    'profit_adj': 'revenue_adj - budget_adj',
+    'roi_adj': 'profit_adj / budget_adj',
+}
+
+
+def inputs(expression):
+    """Names of the columns ``expression`` reads."""
+    return sorted({node.id for node in ast.walk(ast.parse(expression, mode='eval')) if isinstance(node, ast.Name)})
+
+
+def evaluate(expression, columns):
+    """Evaluate ``expression`` over the arrays in ``columns``."""
+    if numexpr is not None:
+        return numexpr.evaluate(expression, local_dict=dict(columns))
+    code = compile(expression, '<derived>', 'eval')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(eval(code, {'__builtins__': {}}, dict(columns)))
+
+
+class DerivedColumns(Mapping):
+    """The columns of ``frame`` plus the derived columns computable from them."""
+
+    def __init__(self, frame, definitions=DEFINITIONS):
+        self.frame = frame
+        self.definitions = dict(definitions)
+        self._values = {}
+
+    @property
+    def index(self):
+        return self.frame.index
+
+    def register(self, name, expression):
+        """Declare (or redefine) the derived column ``name``."""
+        if name in self.frame:
+            raise ValueError('{!r} is a column of the frame'.format(name))
+        self.invalidate(name)
+        self.definitions[name] = expression
+
+    def available(self, name):
+        """Whether ``name`` is a frame column or computable from them."""
+        if name in self.frame:
+            return True
+        if name not in self.definitions:
+            return False
+        return all(self.available(column) for column in inputs(self.definitions[name]))
+
+    def __getitem__(self, name):
+        if name in self._values:
+            return self._values[name]
+        if name in self.frame:
+            column = self.frame[name]
+            values = column_values(column) if is_numeric_dtype(column.dtype) else column.to_numpy()
+        elif name in self.definitions:
+            expression = self.definitions[name]
+            values = evaluate(expression, {column: self[column] for column in inputs(expression)})
+        else:
+            raise KeyError(name)
+        self._values[name] = values
+        return values
+
+    def __iter__(self):
+        yield from self.frame.columns
+        for name in self.definitions:
+            if name not in self.frame and self.available(name):
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, name):
+        return self.available(name)
+
+    def invalidate(self, *columns):
+        """Drop cached values of ``columns`` and of everything derived from them.
+
+        Without arguments every cached value is dropped, e.g. after the
+        frame was edited in place.
+        """
+        if not columns:
+            self._values.clear()
+            return
+        stale = set(columns)
+        changed = True
+        while changed:
+            changed = False
+            for name, expression in self.definitions.items():
+                if name not in stale and stale.intersection(inputs(expression)):
+                    stale.add(name)
+                    changed = True
+        for name in stale:
+            self._values.pop(name, None)
@@ -0,0 +1,133 @@
+"""Min, max, argmin and argmax for many columns in one pass.
+
+The notebook's ``calculate(column)`` runs ``idxmax`` and ``idxmin``
+separately and is called once per column.  ``extremes`` copies the
+requested columns into a single float64 block and reduces it column-wise,
+so every column is covered by the same pair of reductions.
+
+``data`` may be a DataFrame or any mapping of column name to array.
+Values are compared as float64, which is exact for the money and runtime
+columns (all well below 2**53).
+"""
+
+import numpy as np
+import pandas as pd
+
+from tmdb.columns import float_block, float_column
+
+
+def _labels(data, rows):
+    index = getattr(data, 'index', None)
+    return pd.RangeIndex(rows) if index is None else index
+
+
+class Extremes:
+    """Result of ``extremes``: one entry per column.
+
+    ``argmax``/``argmin`` are row positions (-1 for an all-missing column),
+    ``idxmax``/``idxmin`` the matching index labels and ``maximum``/
+    ``minimum`` the values, each as a Series indexed by column name.
+    """
+
+    def __init__(self, columns, argmax, argmin, maximum, minimum, index):
+        self.columns = list(columns)
+        self.argmax = pd.Series(argmax, index=self.columns, name='argmax')
+        self.argmin = pd.Series(argmin, index=self.columns, name='argmin')
+        self.maximum = pd.Series(maximum, index=self.columns, name='max')
+        self.minimum = pd.Series(minimum, index=self.columns, name='min')
+        self.idxmax = self._label(index, argmax, 'idxmax')
+        self.idxmin = self._label(index, argmin, 'idxmin')
+
+    def _label(self, index, positions, name):
+        labels = [index[p] if p >= 0 else None for p in positions]
+        return pd.Series(labels, index=self.columns, name=name, dtype=object)
+
+    def to_frame(self):
+        """One row per column with min, max, idxmin and idxmax."""
+        return pd.concat([self.minimum, self.maximum, self.idxmin, self.idxmax], axis=1)
+
+    def details(self, df, column):
+        """The highest and lowest rows of ``df`` for ``column``, side by side.
+
+        Same layout as the notebook's ``calculate``: one column per movie,
+        named by its index label, highest first.  Raises ``ValueError`` when
+        ``column`` has no values.
+        """
+        high, low = self.positions(column)
+        return pd.concat([df.iloc[high], df.iloc[low]], axis=1)
+
+    def positions(self, column):
+        """Row positions (highest, lowest) of ``column``; ``ValueError`` when it has no values."""
+        high, low = int(self.argmax[column]), int(self.argmin[column])
+        if high < 0 or low < 0:
+            raise ValueError('{!r} has no values, so no highest or lowest row'.format(column))
+        return high, low
+
+    def __repr__(self):
+        return '{}(\n{}\n)'.format(type(self).__name__, self.to_frame())
+
+
+def extremes(data, columns):
+    """Compute min, max, argmin and argmax of every column in ``columns``.
+
+    Missing values are skipped.  Ties resolve to the first row, as with
+    ``idxmax``/``idxmin``.
+    """
+    columns = list(columns)
+    block = float_block(data, columns)
+    index = _labels(data, len(block))
+    if not len(block):
+        missing = np.full(len(columns), -1)
+        nan = np.full(len(columns), np.nan)
+        return Extremes(columns, missing, missing, nan, nan, index)
+
+    missing = np.isnan(block)
+    empty = missing.all(axis=0)
+    every_column = np.arange(len(columns))
+
+    # reuse the block for both reductions instead of nanargmax/nanargmin,
+    # which each make their own filled copy
+    block[missing] = -np.inf
+    argmax = block.argmax(axis=0)
+    maximum = block[argmax, every_column]
+    block[missing] = np.inf
+    argmin = block.argmin(axis=0)
+    minimum = block[argmin, every_column]
+
+    return Extremes(
+        columns,
+        np.where(empty, -1, argmax),
+        np.where(empty, -1, argmin),
+        np.where(empty, np.nan, maximum),
+        np.where(empty, np.nan, minimum),
+        index,
+    )
+
+
+def top_k_positions(values, k, largest=True):
+    """Row positions of the ``k`` largest (or smallest) ``values``, in order.
+
+    Uses ``argpartition`` so only the selected rows are sorted.  Missing
+    values come last.
+    """
+    values = float_column(values)
+    keys = -values if largest else values.copy()
+    keys[np.isnan(keys)] = np.inf
+    k = min(k, len(keys))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(keys):
+        selected = np.argpartition(keys, k - 1)[:k]
+    else:
+        selected = np.arange(len(keys))
+    return selected[np.argsort(keys[selected], kind='stable')]
+
+
+def top_k(df, column, k=100):
+    """Rows of ``df`` with the ``k`` largest values of ``column``."""
+    return df.iloc[top_k_positions(df[column], k, largest=True)]
+
+
+def bottom_k(df, column, k=100):
+    """Rows of ``df`` with the ``k`` smallest values of ``column``."""
+    return df.iloc[top_k_positions(df[column], k, largest=False)]
@@ -0,0 +1,233 @@
+"""The notebook's figures as functions of plain arrays.
+
+Each figure is a ``FigureSpec``: a name, a module-level plot function,
+the arrays it draws and a few options.  Plot functions receive a fresh
+matplotlib Figure and draw onto it, so they never touch global pyplot
+state.  matplotlib and seaborn are imported only when a figure is drawn.
+
+``render_all`` draws the specs on a process pool with the Agg backend.
+The arrays are placed in shared memory once and mapped by the workers,
+so only the small descriptors and options are pickled.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tmdb.reduce import reduce_scatter, reduce_swarm
+from tmdb.sketch import ColumnSketch
+from tmdb.shm import Attached, SharedArrays
+
+FigureSpec = namedtuple('FigureSpec', ['name', 'plot', 'data', 'figsize', 'options'])
+
+
+def _axes(fig):
+    return fig.add_subplot(1, 1, 1)
+
+
+def _seaborn():
+    import seaborn as sns
+    sns.set_theme(style='whitegrid')
+    return sns
+
+
+def scatter(fig, data, title, xlabel, ylabel, **kwargs):
+    """Points, or a 2-D histogram when ``data`` comes from ``reduce_scatter`` above its threshold."""
+    ax = _axes(fig)
+    if 'counts' in data:
+        from matplotlib.colors import LogNorm
+        counts = np.where(data['counts'] > 0, data['counts'], np.nan)
+        mesh = ax.pcolormesh(data['xedges'], data['yedges'], counts.T, norm=LogNorm(), cmap='Blues')
+        fig.colorbar(mesh, ax=ax, label='Movies')
+    else:
+        ax.scatter(data['x'], data['y'], **kwargs)
+    ax.set(title=title, xlabel=xlabel, ylabel=ylabel)
+
+
+def histogram(fig, data, title, xlabel, ylabel, **kwargs):
+    """``plt.hist`` look from precomputed counts, e.g. ``ColumnSketch.histogram``."""
+    ax = _axes(fig)
+    edges = data['edges']
+    ax.hist(edges[:-1], bins=edges, weights=data['counts'], rwidth=0.9, **kwargs)
+    ax.set_title(title, fontsize=18)
+    ax.set_xlabel(xlabel, fontsize=15)
+    ax.set_ylabel(ylabel, fontsize=15)
+
+
+def histogram_kde(fig, data, title, xlabel, ylabel):
+    """Histogram with a (weighted) KDE from precomputed counts."""
+    sns = _seaborn()
+    ax = _axes(fig)
+    edges = data['edges']
+    centers = (edges[:-1] + edges[1:]) / 2
+    binned = {'value': centers, 'count': data['counts']}
+    # seaborn compares bins with 'auto', so hand it a list rather than an array
+    sns.histplot(binned, x='value', weights='count', bins=list(edges), kde=True, color='skyblue', ax=ax)
+    ax.set(title=title, xlabel=xlabel, ylabel=ylabel)
+
+
+def boxplot_from_stats(fig, data, title, xlabel, horizontal=True, linewidth=1.5, color='#4c72b0'):
+    """Box plot drawn from ``ColumnSketch.boxplot_stats`` instead of raw values."""
+    ax = _axes(fig)
+    whislo, q1, median, q3, whishi, mean = data['stats']
+    stats = [{'whislo': whislo, 'q1': q1, 'med': median, 'q3': q3, 'whishi': whishi,
+              'mean': mean, 'fliers': data['fliers']}]
+    lines = {'linewidth': linewidth}
+    style = dict(patch_artist=True, boxprops=dict(lines, facecolor=color), whiskerprops=lines,
+                 capprops=lines, medianprops=lines)
+    try:
+        ax.bxp(stats, orientation='horizontal' if horizontal else 'vertical', **style)
+    except TypeError:
+        # matplotlib < 3.10
+        ax.bxp(stats, vert=not horizontal, **style)
+    # a single box needs no position tick
+    (ax.set_yticks if horizontal else ax.set_xticks)([])
+    ax.set(title=title, xlabel=xlabel)
+
+
+def swarm(fig, data, title, xlabel, total=None):
+    """Swarm of ``data['values']``; ``total`` notes the full count when sampled."""
+    sns = _seaborn()
+    ax = _axes(fig)
+    sns.swarmplot(x=data['values'], color='purple', size=3, ax=ax)
+    if total is not None and total > len(data['values']):
+        title = '{} (sample of {:,} of {:,})'.format(title, len(data['values']), total)
+    ax.set(title=title, xlabel=xlabel)
+
+
+def barh(fig, data, title, xlabel, labels):
+    ax = _axes(fig)
+    ax.barh(labels, data['values'], color='#00994C')
+    ax.set_title(title)
+    ax.set_xlabel(xlabel, color='black', fontsize=15)
+    ax.tick_params(labelsize=15)
+
+
+def line(fig, data, title, xlabel, ylabel):
+    ax = _axes(fig)
+    ax.plot(data['x'], data['y'], marker='o', linestyle='-')
+    ax.set(title=title, xlabel=xlabel, ylabel=ylabel)
+
+
+def heatmap(fig, data, title, labels):
+    sns = _seaborn()
+    ax = _axes(fig)
+    sns.heatmap(data['matrix'], annot=True, cmap='coolwarm', linewidths=.5,
+                xticklabels=labels, yticklabels=labels, ax=ax)
+    ax.set_title(title)
+
+
+def grouped_bars(fig, data, title, xlabel, ylabel, groups):
+    sns = _seaborn()
+    ax = _axes(fig)
+    sns.barplot(x=data['x'], y=data['y'], hue=np.asarray(groups, dtype=object), ax=ax)
+    ax.set(title=title, xlabel=xlabel, ylabel=ylabel)
+    ax.legend(title='Genre', bbox_to_anchor=(1.05, 1), loc='upper left')
+
+
+def _float(values):
+    return values.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def figure_specs(results, frame):
+    """Specs for every figure of the notebook.
+
+    ``results`` is the dict returned by ``tmdb.report.research_questions``
+    and ``frame`` the cleaned movies frame.  Scatter, swarm and histogram
+    data go through ``tmdb.reduce``, and runtime histograms and box plots
+    are drawn from one ``ColumnSketch``, so large frames are drawn from
+    aggregated or sampled arrays.
+    """
+    runtime = _float(frame['runtime'])
+    known_runtime = runtime[~np.isnan(runtime)]
+    runtime_sketch = ColumnSketch.of(known_runtime)
+    runtime_box = runtime_sketch.boxplot_stats()
+    revenue = _float(frame['revenue'])
+    genres = results['profitable_genres'].sort_values(ascending=True)
+    popular = results['most_popular_genres']
+    correlation = results['correlation_matrix']
+    profits = results['profits_by_year']
+
+    return [
+        FigureSpec('runtime_vs_revenue', scatter, reduce_scatter(runtime, revenue), (12, 6), {
+            'title': 'Relationship Between Runtime and Revenue',
+            'xlabel': 'Runtime (minutes)', 'ylabel': 'Revenue (in billions)'}),
+        FigureSpec('profitable_genres', barh, {'values': genres.to_numpy()}, (12, 9), {
+            'title': 'Frequent Used Genres in Profitable Movies',
+            'xlabel': 'No.of Movies in the dataset', 'labels': list(genres.index)}),
+        FigureSpec('correlation_matrix', heatmap, {'matrix': correlation.to_numpy()}, (12, 8), {
+            'title': 'Correlation Matrix', 'labels': list(correlation.columns)}),
+        FigureSpec('runtime_histogram', histogram, runtime_sketch.histogram(35), (9, 5), {
+            'title': 'Runtime of all the movies', 'xlabel': 'Runtime of the Movies',
+            'ylabel': 'No.of Movies in the Dataset'}),
+        FigureSpec('runtime_distribution', histogram_kde, runtime_sketch.histogram(30), (12, 6), {
+            'title': 'Distribution of Movie Runtimes', 'xlabel': 'Runtime (minutes)',
+            'ylabel': 'Frequency'}),
+        FigureSpec('runtime_boxplot_vertical', boxplot_from_stats, runtime_box, (9, 7), {
+            'title': '', 'xlabel': '', 'horizontal': False, 'linewidth': 3}),
+        FigureSpec('runtime_swarm', swarm, reduce_swarm(known_runtime), (12, 6), {
+            'title': 'Swarm Plot of Movie Runtimes', 'xlabel': 'Runtime (minutes)',
+            'total': len(known_runtime)}),
+        FigureSpec('runtime_boxplot', boxplot_from_stats, runtime_box, (10, 6), {
+            'title': 'Box Plot of Movie Runtimes', 'xlabel': 'Runtime (minutes)', 'color': 'skyblue'}),
+        FigureSpec('runtime_by_index', scatter, reduce_scatter(np.arange(len(runtime)), runtime), (12, 6), {
+            'title': 'Scatter Plot of Movie Runtimes', 'xlabel': 'Movie Index',
+            'ylabel': 'Runtime (minutes)', 'color': 'skyblue', 'alpha': 0.7}),
+        FigureSpec('profits_by_year', line, {
+            'x': profits.index.to_numpy(dtype='float64'), 'y': profits.to_numpy(dtype='float64')}, (12, 6), {
+            'title': 'Total Profits Earned by All Movies Over Release Years',
+            'xlabel': 'Release Year', 'ylabel': 'Total Profits Earned by Movies'}),
+        FigureSpec('most_popular_genres', grouped_bars, {
+            'x': popular['release_year'].to_numpy(), 'y': popular['count'].to_numpy()}, (14, 8), {
+            'title': 'Most Popular Genres from Year to Year', 'xlabel': 'Release Year',
+            'ylabel': 'Count', 'groups': list(popular['genre'])}),
+        FigureSpec('budget_vs_revenue', scatter, reduce_scatter(_float(frame['budget']), revenue), (10, 6), {
+            'title': 'Correlation between Budget and Revenue', 'xlabel': 'Budget (dollars)',
+            'ylabel': 'Revenue (dollars)'}),
+    ]
+
+
+def render(spec, out_dir, dpi=100):
+    """Draw ``spec`` with the Agg backend and save it as ``<name>.png``."""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.figsize, dpi=dpi)
+    spec.plot(fig, spec.data, **spec.options)
+    path = os.path.join(out_dir, spec.name + '.png')
+    fig.savefig(path, bbox_inches='tight')
+    return path
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render_shared(spec, out_dir, dpi):
+    with Attached(spec.data) as data:
+        return render(spec._replace(data=data), out_dir, dpi)
+
+
+def render_all(specs, out_dir, dpi=100, workers=None):
+    """Render every spec into ``out_dir``; returns the written paths.
+
+    Figures are drawn on a pool of ``workers`` processes (default: one per
+    core).  ``workers=1`` draws them in this process instead.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(specs))
+    if workers <= 1:
+        return [render(spec, out_dir, dpi) for spec in specs]
+
+    with SharedArrays() as shared:
+        shared_specs = [
+            spec._replace(data={key: shared.share(values) for key, values in spec.data.items()})
+            for spec in specs
+        ]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_render_shared, spec, out_dir, dpi) for spec in shared_specs]
+            return [future.result() for future in futures]
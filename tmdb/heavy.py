@@ -0,0 +1,179 @@
+"""Approximate top-k counting (heavy hitters) for pipe-delimited columns.
+
+``SpaceSaving`` tracks at most ``capacity`` distinct values (the
+Space-Saving algorithm of Metwally et al., with weighted updates).  Every
+reported count overestimates the true count by at most its ``error``, and
+no error exceeds ``total / capacity``; any value whose true count is above
+that bound is guaranteed to be tracked.  Summaries are mergeable, so each
+segment (year, genre, profit band) or worker partition can keep its own
+and combine them later.
+
+Values are fed a chunk at a time (``update_strings``, or ``heavy_hitters``
+over an iterable of frames such as ``tmdb.streaming.iter_clean_chunks``).
+Each chunk is split and pre-aggregated with ``value_counts``, so memory is
+bounded by ``capacity`` plus one chunk however many distinct names the
+column has, and the per-item Python work is one update per distinct value
+in the chunk.
+
+Segments can be multi-valued: with ``segment_sep='|'`` a movie listed under
+Action and Drama counts towards both genres' summaries.
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+class SpaceSaving:
+    """Space-Saving summary of at most ``capacity`` counters."""
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        # lazy min-heap of (count, value); stale entries are skipped on pop
+        self._heap = []
+
+    def __len__(self):
+        return len(self._counts)
+
+    @property
+    def error_bound(self):
+        """Largest possible overestimate of any reported count."""
+        return self.total / self.capacity
+
+    def _push(self, value):
+        heapq.heappush(self._heap, (self._counts[value], value))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        while True:
+            count, value = heapq.heappop(self._heap)
+            if self._counts.get(value) == count:
+                return value, count
+
+    def add(self, value, weight=1):
+        """Count ``value`` ``weight`` more times."""
+        self.total += weight
+        if value in self._counts:
+            self._counts[value] += weight
+        elif len(self._counts) < self.capacity:
+            self._counts[value] = weight
+            self._errors[value] = 0
+        else:
+            evicted, floor = self._pop_min()
+            del self._counts[evicted]
+            del self._errors[evicted]
+            self._counts[value] = floor + weight
+            self._errors[value] = floor
+        self._push(value)
+
+    def update(self, values, weights=None):
+        """Count every value of ``values`` (with optional ``weights``)."""
+        if weights is None:
+            values, weights = np.unique(np.asarray(values, dtype=object), return_counts=True)
+        for value, weight in zip(values, weights):
+            self.add(value, int(weight))
+
+    def update_strings(self, values, sep='|'):
+        """Count the ``sep``-separated values of the strings in ``values`` (one chunk)."""
+        counts = _split(values, sep).value_counts(sort=True)
+        # heaviest first, so light values are the ones that get evicted
+        self.update(counts.index, counts.to_numpy())
+
+    def _floor(self):
+        return min(self._counts.values()) if len(self._counts) >= self.capacity else 0
+
+    def merge(self, other):
+        """Fold ``other`` into this summary; bounds still hold afterwards."""
+        floor, other_floor = self._floor(), other._floor()
+        counts = {}
+        errors = {}
+        for value in self._counts.keys() | other._counts.keys():
+            counts[value] = self._counts.get(value, floor) + other._counts.get(value, other_floor)
+            errors[value] = self._errors.get(value, floor) + other._errors.get(value, other_floor)
+        kept = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self._counts = {value: counts[value] for value in kept}
+        self._errors = {value: errors[value] for value in kept}
+        self._heap = [(count, value) for value, count in self._counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+
+    def top(self, k=None):
+        """The ``k`` largest counts, shaped like ``value_counts().head(k)``."""
+        values = sorted(self._counts, key=self._counts.get, reverse=True)[:k]
+        return pd.Series([self._counts[v] for v in values], index=pd.Index(values, dtype=object), name='count')
+
+    def top_with_errors(self, k=None):
+        """Like ``top`` with ``error`` and ``guaranteed`` (count - error) columns."""
+        counts = self.top(k)
+        errors = np.array([self._errors[value] for value in counts.index], dtype=np.int64)
+        return pd.DataFrame({'count': counts, 'error': errors, 'guaranteed': counts.to_numpy() - errors})
+
+
+class SegmentedHeavyHitters:
+    """One ``SpaceSaving`` summary per segment (e.g. year, genre, profit band)."""
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.segments = {}
+
+    def summary(self, segment):
+        if segment not in self.segments:
+            self.segments[segment] = SpaceSaving(self.capacity)
+        return self.segments[segment]
+
+    def update_strings(self, values, segments, sep='|', segment_sep=None):
+        """Count the ``sep``-separated ``values`` per row segment (one chunk).
+
+        ``segments`` has one key per row, or with ``segment_sep`` a
+        separated list of keys per row (e.g. the genres column), in which
+        case the row's values count towards every one of its segments.
+        """
+        pairs = pd.DataFrame({'segment': np.asarray(segments, dtype=object), 'value': _split_rows(values, sep)})
+        if segment_sep is not None:
+            pairs['segment'] = _split_rows(pairs['segment'], segment_sep)
+            pairs = pairs.explode('segment')
+        pairs = pairs.explode('value').dropna()
+        counts = pairs.value_counts(['segment', 'value'], sort=True)
+        for segment, group in counts.groupby(level='segment', sort=False):
+            self.summary(segment).update(group.index.get_level_values('value'), group.to_numpy())
+
+    def merge(self, other):
+        for segment, summary in other.segments.items():
+            self.summary(segment).merge(summary)
+
+    def top(self, segment, k=None):
+        return self.segments[segment].top(k)
+
+
+def _split_rows(values, sep):
+    values = pd.Series(values, copy=False)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    return values.str.split(sep, regex=False).to_numpy()
+
+
+def _split(values, sep):
+    return pd.Series(_split_rows(values, sep)).explode().dropna()
+
+
+def heavy_hitters(chunks, column, capacity=1000, segment=None, sep='|', segment_sep=None):
+    """Stream ``column`` of every frame in ``chunks`` into a summary.
+
+    Returns a ``SpaceSaving``, or with ``segment`` (a column name) a
+    ``SegmentedHeavyHitters`` keyed by that column's values.
+    """
+    summary = SpaceSaving(capacity) if segment is None else SegmentedHeavyHitters(capacity)
+    for chunk in chunks:
+        if segment is None:
+            summary.update_strings(chunk[column], sep)
+        else:
+            summary.update_strings(chunk[column], chunk[segment], sep, segment_sep)
+    return summary
@@ -0,0 +1,157 @@
+"""Sparse movie x genre / movie x cast incidence matrices.
+
+Row ``i`` of an ``Incidence`` matrix is movie ``i`` and column ``j`` is
+vocabulary entry ``j``; the value is how often the token occurs in that
+movie's cell (almost always 1).  Per-token questions become sparse
+matrix-vector products:
+
+* how many profitable movies per cast member: ``counts_by(profitable)``
+* average revenue per genre: ``mean_by('revenue')``
+* genre counts per year: ``group_by_year()``
+
+The matrix is built straight from the CSR arrays of ``tmdb.tokens`` and
+needs scipy.  ``Segments.incidence`` (and ``MovieDataset.incidence``) build
+it over a frame, so values and years can be given as column names and
+masks as ``tmdb.segments.Segment``::
+
+    genres = movies.incidence('genres')
+    genres.mean_by('revenue', mask=movies.profitable())
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from tmdb.tokens import tokenize
+
+
+def _row_vector(values, rows):
+    if isinstance(values, pd.Series):
+        values = values.to_numpy(dtype='float64', na_value=np.nan)
+    values = np.asarray(values, dtype='float64')
+    if len(values) != rows:
+        raise ValueError('expected {} values, got {}'.format(rows, len(values)))
+    return values
+
+
+def _mask(mask):
+    # a Segment or anything array-like
+    return np.asarray(getattr(mask, 'mask', mask), dtype=bool)
+
+
+class Incidence:
+    """Movie x token incidence matrix with its vocabulary and row labels.
+
+    ``segments`` (a ``tmdb.segments.Segments`` over the same rows) lets
+    values and years be given as column names.
+    """
+
+    def __init__(self, matrix, vocabulary, index, name=None, segments=None):
+        self.matrix = matrix.tocsr()
+        self.vocabulary = pd.Index(vocabulary, name=name)
+        self.index = index
+        self.name = name
+        self.segments = segments
+
+    @classmethod
+    def from_tokens(cls, tokens, segments=None):
+        """Build the matrix from a ``tmdb.tokens.Tokens``."""
+        data = np.ones(len(tokens.codes), dtype=np.int32)
+        matrix = sp.csr_matrix(
+            (data, tokens.codes, tokens.offsets),
+            shape=(len(tokens), len(tokens.vocabulary)),
+        )
+        matrix.sum_duplicates()
+        return cls(matrix, tokens.vocabulary, tokens.index, tokens.name, segments)
+
+    @classmethod
+    def build(cls, df, column):
+        """Tokenize ``df[column]`` and build its incidence matrix."""
+        return cls.from_tokens(tokenize(df[column]))
+
+    def __repr__(self):
+        return '{}({!r}: {} movies x {} tokens, {} entries)'.format(
+            type(self).__name__, self.name, *self.matrix.shape, self.matrix.nnz)
+
+    def save(self, directory):
+        """Write the matrix, vocabulary and row labels into ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        sp.save_npz(os.path.join(directory, 'matrix.npz'), self.matrix)
+        np.save(os.path.join(directory, 'vocabulary.npy'), self.vocabulary.to_numpy(dtype=str))
+        np.save(os.path.join(directory, 'index.npy'), self.index.to_numpy())
+        with open(os.path.join(directory, 'name.txt'), 'w') as f:
+            f.write(self.name or '')
+
+    @classmethod
+    def load(cls, directory):
+        """Read an incidence matrix written by ``save``."""
+        matrix = sp.load_npz(os.path.join(directory, 'matrix.npz'))
+        vocabulary = np.load(os.path.join(directory, 'vocabulary.npy')).astype(object)
+        index = pd.Index(np.load(os.path.join(directory, 'index.npy')))
+        with open(os.path.join(directory, 'name.txt')) as f:
+            name = f.read() or None
+        return cls(matrix, vocabulary, index, name)
+
+    def _values(self, values):
+        if isinstance(values, str):
+            if self.segments is None:
+                raise ValueError('column {!r} given, but the matrix has no frame; pass the values'.format(values))
+            values = self.segments.values(values)
+        return _row_vector(values, self.matrix.shape[0])
+
+    def _series(self, values, name):
+        return pd.Series(np.asarray(values).ravel(), index=self.vocabulary, name=name)
+
+    def counts_by(self, mask=None):
+        """Number of movies per token, optionally only where ``mask`` is true."""
+        if mask is None:
+            weights = np.ones(self.matrix.shape[0], dtype=np.int64)
+        else:
+            weights = _mask(mask).astype(np.int64)
+        return self._series(self.matrix.T @ weights, 'count')
+
+    def sum_by(self, values, mask=None):
+        """Sum of ``values`` (one per movie, or a column name) per token.
+
+        Missing values count as 0.
+        """
+        values = np.nan_to_num(self._values(values))
+        if mask is not None:
+            values = values * _mask(mask)
+        return self._series(self.matrix.T @ values, 'sum')
+
+    def mean_by(self, values, mask=None):
+        """Mean of ``values`` (or a column name) per token, skipping missing values."""
+        values = self._values(values)
+        present = ~np.isnan(values)
+        if mask is not None:
+            present &= _mask(mask)
+        totals = self.matrix.T @ np.where(present, values, 0.0)
+        counts = self.matrix.T @ present.astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._series(totals / counts, 'mean')
+
+    def group_by_year(self, years='release_year', mask=None):
+        """Token counts per year: a (years x tokens) DataFrame.
+
+        ``years`` is one year per movie or a column name; movies without a
+        year are left out.
+        """
+        years = self._values(years)
+        year_codes, unique_years = pd.factorize(years, sort=True)
+        keep = year_codes >= 0
+        if mask is not None:
+            keep &= _mask(mask)
+        rows = np.flatnonzero(keep)
+        by_year = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (year_codes[rows], rows)),
+            shape=(len(unique_years), len(years)),
+        )
+        counts = (by_year @ self.matrix).toarray()
+        return pd.DataFrame(
+            counts,
+            index=pd.Index(unique_years.astype(np.int64), name='release_year'),
+            columns=self.vocabulary,
+        )
@@ -0,0 +1,189 @@
+"""Inverted index from cast members and directors to movies.
+
+"Which movies did Tom Cruise appear in" is a ``str.contains`` scan over
+every cast string.  ``InvertedIndex`` answers it from three arrays:
+
+* ``vocabulary``: every distinct name UTF-8 encoded, sorted, as an ``'S'``
+  array (a byte per ASCII character where ``'U'`` takes four);
+* ``offsets``: where each name's postings start in ``postings``;
+* ``postings``: row positions, ascending within each name.
+
+UTF-8 bytes sort in code-point order, so a point lookup is still one
+``searchsorted`` in the vocabulary and a slice of the postings; a prefix is a ``searchsorted`` range; "movies with both X and Y"
+intersects sorted postings.  ``save`` writes the arrays as ``.npy`` files
+and ``load`` memory-maps them, so opening an index costs nothing and only
+the pages touched by a query are read.  ``cached_index`` keeps one index
+per column next to the cleaned-data cache of ``tmdb.cache``.
+
+Results are row positions in the cleaned frame: pass them to
+``Segments.rows`` or ``frame.iloc``.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from tmdb.cache import CACHE_DIR, cache_key, cached_clean_movies, source_id, stale_entries
+from tmdb.cleaning import CLEANING_CONFIG
+from tmdb.tokens import tokenize
+
+INDEX_COLUMNS = ('cast', 'director')
+
+# never occurs in UTF-8, so it sorts after every continuation of a prefix
+_MAX_BYTE = b'\xff'
+
+# bumped when the saved layout changes; older indexes are rebuilt
+INDEX_FORMAT = 2
+
+
+class InvertedIndex:
+    """Postings of the '|'-separated values of one column."""
+
+    def __init__(self, vocabulary, offsets, postings, rows, name=None):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = postings
+        self.rows = rows
+        self.name = name
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        """Index a ``tmdb.tokens.Tokens``."""
+        vocabulary = np.array([str(name).encode('utf-8') for name in tokens.vocabulary], dtype=bytes)
+        order = np.argsort(vocabulary, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+
+        # one posting per (name, row), ordered by name and then row
+        keys = np.unique(rank[tokens.codes] * max(len(tokens), 1) + tokens.row_ids())
+        terms, rows = np.divmod(keys, max(len(tokens), 1))
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocabulary)), out=offsets[1:])
+        dtype = np.int32 if len(tokens) < np.iinfo(np.int32).max else np.int64
+        return cls(vocabulary[order], offsets, rows.astype(dtype), len(tokens), tokens.name)
+
+    @classmethod
+    def build(cls, df, column):
+        """Index the '|'-separated ``column`` of ``df``."""
+        return cls.from_tokens(tokenize(df[column]))
+
+    def save(self, directory):
+        """Write the index into ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'vocabulary.npy'), self.vocabulary)
+        np.save(os.path.join(directory, 'offsets.npy'), self.offsets)
+        np.save(os.path.join(directory, 'postings.npy'), self.postings)
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump({'name': self.name, 'rows': int(self.rows), 'format': INDEX_FORMAT}, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open an index written by ``save``, memory-mapped unless ``mmap=False``."""
+        mode = 'r' if mmap else None
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        return cls(
+            np.load(os.path.join(directory, 'vocabulary.npy'), mmap_mode=mode),
+            np.load(os.path.join(directory, 'offsets.npy'), mmap_mode=mode),
+            np.load(os.path.join(directory, 'postings.npy'), mmap_mode=mode),
+            meta['rows'],
+            meta['name'],
+        )
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def _find(self, term):
+        term = term.encode('utf-8')
+        position = int(np.searchsorted(self.vocabulary, term))
+        if position < len(self.vocabulary) and self.vocabulary[position] == term:
+            return position
+        return -1
+
+    def __contains__(self, term):
+        return self._find(term) >= 0
+
+    def lookup(self, term):
+        """Rows containing ``term``, ascending (a view of the postings)."""
+        position = self._find(term)
+        if position < 0:
+            return self.postings[:0]
+        return self.postings[self.offsets[position]:self.offsets[position + 1]]
+
+    def _prefix_range(self, prefix):
+        prefix = prefix.encode('utf-8')
+        lo = int(np.searchsorted(self.vocabulary, prefix, side='left'))
+        hi = int(np.searchsorted(self.vocabulary, prefix + _MAX_BYTE, side='left'))
+        return lo, hi
+
+    def terms(self, prefix):
+        """Indexed names starting with ``prefix``, sorted."""
+        lo, hi = self._prefix_range(prefix)
+        return [name.decode('utf-8') for name in self.vocabulary[lo:hi]]
+
+    def prefix(self, prefix):
+        """Rows containing any name starting with ``prefix``, ascending."""
+        lo, hi = self._prefix_range(prefix)
+        return np.unique(self.postings[self.offsets[lo]:self.offsets[hi]])
+
+    def all_of(self, *terms):
+        """Rows containing every one of ``terms``, ascending."""
+        postings = sorted((self.lookup(term) for term in terms), key=len)
+        if not postings:
+            return self.postings[:0]
+        rows = np.asarray(postings[0])
+        for other in postings[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def any_of(self, *terms):
+        """Rows containing at least one of ``terms``, ascending."""
+        if not terms:
+            return self.postings[:0]
+        return np.unique(np.concatenate([self.lookup(term) for term in terms]))
+
+    def mask(self, rows):
+        """Boolean vector over all indexed rows, true at ``rows``."""
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[rows] = True
+        return mask
+
+
+def cached_index(path='tmdb-movies.csv', column='cast', frame=None, config=CLEANING_CONFIG,
+                 cache_dir=CACHE_DIR, refresh=False):
+    """The memory-mapped ``InvertedIndex`` of ``column`` for the cleaned ``path``.
+
+    The index is built from ``frame`` (default: the cached cleaned frame) on
+    the first call and stored under the same key as the cleaned-data cache;
+    indexes of other versions of the same source or of the config are
+    removed then.
+    """
+    source = source_id(path)
+    key = cache_key(path, config, cache_dir)
+    root = os.path.join(cache_dir, 'index-{}-{}'.format(source, key))
+    directory = os.path.join(root, column)
+
+    if not refresh and _index_format(directory) == INDEX_FORMAT:
+        return InvertedIndex.load(directory)
+
+    if frame is None:
+        frame = cached_clean_movies(path, config, cache_dir)
+    tmp = directory + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    InvertedIndex.build(frame, column).save(tmp)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp, directory)
+
+    for stale in stale_entries(os.path.join(cache_dir, 'index-{}-*'.format(source)), root):
+        shutil.rmtree(stale, ignore_errors=True)
+    return InvertedIndex.load(directory)
+
+
+def _index_format(directory):
+    try:
+        with open(os.path.join(directory, 'meta.json')) as f:
+            return json.load(f).get('format', 1)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,357 @@
+"""Research questions 1-9 as partitioned reductions on a process pool.
+
+Most of the questions are independent reductions over the same cleaned
+columns.  ``run_questions`` splits the rows into partitions (contiguous
+row ranges, or whole release years), runs every question's map step on
+each partition in a ``ProcessPoolExecutor`` and folds the partial results
+with question-specific combiners:
+
+==================  ===============================  ======================
+question            partial result                   combiner
+==================  ===============================  ======================
+extremes            value and row per column         keep larger/smaller
+yearly              ``YearlyAggregates``             ``merge``
+genre_years         ``YearGenreCounts``              ``merge``
+profitable          counts, sums, token bincounts    add
+correlation         ``CorrelationAccumulator``       ``merge``
+runtime             ``ColumnSketch``                 ``merge``
+==================  ===============================  ======================
+
+The column and token arrays are placed in shared memory once
+(``tmdb.shm``); tasks only carry the descriptors and a row range.
+"""
+
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from tmdb.correlation import CorrelationAccumulator
+from tmdb.crosstab import YearGenreCounts
+from tmdb.dataset import PROFIT_THRESHOLD
+from tmdb.derived import DerivedColumns
+from tmdb.extremes import extremes
+from tmdb.shm import Attached, SharedArrays
+from tmdb.sketch import ColumnSketch
+from tmdb.tokens import Tokens, tokenize
+from tmdb.yearly import YearlyAggregates
+
+MONEY_AND_RUNTIME = ['budget', 'revenue', 'profit', 'runtime']
+NUMERIC = MONEY_AND_RUNTIME + ['release_year']
+PROFITABLE_MEANS = ['budget', 'revenue', 'runtime']
+
+Question = namedtuple('Question', ['map', 'combine', 'finish'])
+
+
+class ColumnBuffers:
+    """The flat arrays the questions read, plus what is needed to label results.
+
+    ``columns`` holds int64 budget/revenue/profit/release_year and float64
+    runtime (NaN for missing); ``genres`` and ``cast`` are ``Tokens``.
+    """
+
+    def __init__(self, columns, genres, cast, index):
+        self.columns = columns
+        self.genres = genres
+        self.cast = cast
+        self.index = index
+
+    @classmethod
+    def from_frame(cls, frame, derived=None):
+        """Buffers for a cleaned frame, reading ``profit`` from ``derived``.
+
+        ``derived`` defaults to ``tmdb.derived.DerivedColumns(frame)``.
+        """
+        if derived is None:
+            derived = DerivedColumns(frame)
+        columns = {column: np.asarray(derived[column], dtype=np.int64)
+                   for column in ('budget', 'revenue', 'profit', 'release_year')}
+        columns['runtime'] = np.asarray(derived['runtime'], dtype='float64')
+        return cls(columns, tokenize(frame['genres']), tokenize(frame['cast']), frame.index)
+
+    def __len__(self):
+        return len(self.columns['budget'])
+
+    def arrays(self):
+        """Every numeric array, keyed as the workers expect them."""
+        arrays = dict(self.columns)
+        arrays['genre_codes'] = self.genres.codes
+        arrays['genre_offsets'] = self.genres.offsets
+        arrays['cast_codes'] = self.cast.codes
+        arrays['cast_offsets'] = self.cast.offsets
+        return arrays
+
+
+class Partition:
+    """The rows of one partition, as seen by the map steps.
+
+    ``positions`` are the rows' positions in the full dataset.
+    """
+
+    def __init__(self, columns, positions, genres, cast, settings):
+        self.columns = columns
+        self.positions = positions
+        self.genres = genres
+        self.cast = cast
+        self.settings = settings
+
+
+# --- questions 1-4: highest and lowest budget, revenue, profit, runtime
+
+def _map_extremes(part):
+    found = extremes(part.columns, MONEY_AND_RUNTIME)
+    partial = {}
+    for column in MONEY_AND_RUNTIME:
+        high, low = found.argmax[column], found.argmin[column]
+        if high < 0:
+            continue
+        partial[column] = (found.maximum[column], part.positions[high],
+                           found.minimum[column], part.positions[low])
+    return partial
+
+
+def _combine_extremes(a, b):
+    merged = dict(a)
+    for column, (high, high_at, low, low_at) in b.items():
+        if column not in merged:
+            merged[column] = (high, high_at, low, low_at)
+            continue
+        best_high, best_high_at, best_low, best_low_at = merged[column]
+        # ties go to the earlier row, as with idxmax/idxmin
+        if high > best_high or (high == best_high and high_at < best_high_at):
+            best_high, best_high_at = high, high_at
+        if low < best_low or (low == best_low and low_at < best_low_at):
+            best_low, best_low_at = low, low_at
+        merged[column] = (best_high, best_high_at, best_low, best_low_at)
+    return merged
+
+
+def _finish_extremes(partial, buffers):
+    rows = {}
+    for column in MONEY_AND_RUNTIME:
+        high, high_at, low, low_at = partial.get(column, (np.nan, -1, np.nan, -1))
+        rows[column] = {
+            'min': low,
+            'max': high,
+            'idxmin': buffers.index[low_at] if low_at >= 0 else None,
+            'idxmax': buffers.index[high_at] if high_at >= 0 else None,
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+# --- questions 6-8: yearly sums and means, most profitable year
+
+def _map_yearly(part):
+    return YearlyAggregates.build(part.columns, MONEY_AND_RUNTIME)
+
+
+def _combine_merge(a, b):
+    a.merge(b)
+    return a
+
+
+def _finish_yearly(yearly, buffers):
+    return yearly
+
+
+# --- question 9: most popular genre per year
+
+def _map_genre_years(part):
+    table = YearGenreCounts()
+    table.update(part.columns['release_year'], part.genres)
+    return table
+
+
+def _finish_genre_years(table, buffers):
+    return table
+
+
+# --- question 5: properties of profitable movies
+
+def _map_profitable(part):
+    profitable = part.columns['profit'] >= part.settings['profit_threshold']
+    runtime = part.columns['runtime'][profitable]
+    known_runtime = ~np.isnan(runtime)
+    sums = {column: float(part.columns[column][profitable].sum()) for column in ('budget', 'revenue')}
+    sums['runtime'] = float(runtime[known_runtime].sum())
+    return {
+        'count': int(profitable.sum()),
+        'runtime_count': int(known_runtime.sum()),
+        'sums': sums,
+        'genres': part.genres.counts(profitable),
+        'cast': part.cast.counts(profitable),
+    }
+
+
+def _combine_profitable(a, b):
+    return {
+        'count': a['count'] + b['count'],
+        'runtime_count': a['runtime_count'] + b['runtime_count'],
+        'sums': {column: a['sums'][column] + b['sums'][column] for column in a['sums']},
+        'genres': a['genres'] + b['genres'],
+        'cast': a['cast'] + b['cast'],
+    }
+
+
+def _value_counts(counts, vocabulary):
+    order = np.argsort(-counts, kind='stable')
+    order = order[counts[order] > 0]
+    return pd.Series(counts[order], index=pd.Index(vocabulary[order]), name='count')
+
+
+def _mean(total, count):
+    return total / count if count else np.nan
+
+
+def _finish_profitable(partial, buffers):
+    count = partial['count']
+    means = {
+        'budget': _mean(partial['sums']['budget'], count),
+        'revenue': _mean(partial['sums']['revenue'], count),
+        'runtime': _mean(partial['sums']['runtime'], partial['runtime_count']),
+    }
+    return {
+        'count': count,
+        'means': means,
+        'genres': _value_counts(partial['genres'], buffers.genres.vocabulary),
+        'cast': _value_counts(partial['cast'], buffers.cast.vocabulary),
+    }
+
+
+# --- correlations and the runtime distribution
+
+def _map_correlation(part):
+    accumulator = CorrelationAccumulator(NUMERIC, shift=part.settings['correlation_shift'])
+    accumulator.update(part.columns)
+    return accumulator
+
+
+def _finish_correlation(accumulator, buffers):
+    return accumulator.correlation()
+
+
+def _map_runtime(part):
+    sketch = ColumnSketch(name='runtime')
+    sketch.update(part.columns['runtime'])
+    return sketch
+
+
+def _finish_runtime(sketch, buffers):
+    return sketch
+
+
+QUESTIONS = {
+    'extremes': Question(_map_extremes, _combine_extremes, _finish_extremes),
+    'yearly': Question(_map_yearly, _combine_merge, _finish_yearly),
+    'genre_years': Question(_map_genre_years, _combine_merge, _finish_genre_years),
+    'profitable': Question(_map_profitable, _combine_profitable, _finish_profitable),
+    'correlation': Question(_map_correlation, _combine_merge, _finish_correlation),
+    'runtime': Question(_map_runtime, _combine_merge, _finish_runtime),
+}
+
+
+def _partition(arrays, start, stop, settings):
+    if 'order' in arrays:
+        # back in frame order, so ties in argmax/argmin go to the earlier row
+        rows = np.sort(arrays['order'][start:stop])
+    else:
+        rows = np.arange(start, stop)
+    columns = {name: arrays[name][rows] for name in NUMERIC}
+    genres = Tokens(arrays['genre_codes'], arrays['genre_offsets'], settings['genre_vocabulary']).take(rows)
+    cast = Tokens(arrays['cast_codes'], arrays['cast_offsets'], settings['cast_size']).take(rows)
+    return Partition(columns, rows, genres, cast, settings)
+
+
+def _map_all(arrays, start, stop, settings):
+    part = _partition(arrays, start, stop, settings)
+    return {name: QUESTIONS[name].map(part) for name in settings['questions']}
+
+
+def _map_shared(descriptors, start, stop, settings):
+    with Attached(descriptors) as arrays:
+        return _map_all(arrays, start, stop, settings)
+
+
+class _Vocabulary:
+    """Stand-in vocabulary of a known size, so workers can bincount codes."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+
+def _bounds(buffers, partitions, by):
+    """Row ranges and, for ``by='release_year'``, the row order they index."""
+    rows = len(buffers)
+    if by not in ('rows', 'release_year'):
+        raise ValueError("partition by 'rows' or 'release_year', got {!r}".format(by))
+    if not rows:
+        return None, np.zeros(2, dtype=np.int64)
+    cuts = np.linspace(0, rows, partitions + 1).astype(np.int64)
+    if by == 'rows':
+        return None, cuts
+    order = np.argsort(buffers.columns['release_year'], kind='stable')
+    years = buffers.columns['release_year'][order]
+    # move every cut to the start of a year so no year is split
+    cuts = np.unique(np.searchsorted(years, years[np.minimum(cuts, rows - 1)], side='left'))
+    return order, np.append(cuts[cuts < rows], rows)
+
+
+def _column_means(columns):
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = [np.nanmean(columns[column]) if len(columns[column]) else 0.0 for column in NUMERIC]
+    return np.nan_to_num(np.asarray(means, dtype='float64'))
+
+
+def run_questions(data, workers=4, partitions=None, by='rows', profit_threshold=PROFIT_THRESHOLD,
+                  questions=None):
+    """Answer the research questions over ``data`` on ``workers`` processes.
+
+    ``data`` is a cleaned frame (``profit`` is derived) or ``ColumnBuffers``.
+    Rows are split into ``partitions`` (default ``4 * workers``) contiguous
+    ranges, or whole release years with ``by='release_year'``.  Returns a
+    dict with one finished result per question name in ``QUESTIONS``;
+    ``workers=1`` runs everything in this process.
+    """
+    buffers = data if isinstance(data, ColumnBuffers) else ColumnBuffers.from_frame(data)
+    questions = list(QUESTIONS if questions is None else questions)
+    partitions = max(1, min(partitions or 4 * workers, len(buffers) or 1))
+    order, cuts = _bounds(buffers, partitions, by)
+    arrays = buffers.arrays()
+    if order is not None:
+        arrays['order'] = order
+
+    settings = {
+        'questions': questions,
+        'profit_threshold': profit_threshold,
+        'genre_vocabulary': buffers.genres.vocabulary,
+        'cast_size': _Vocabulary(len(buffers.cast.vocabulary)),
+        # every partition shifts by the same means so the sums merge exactly
+        'correlation_shift': _column_means(buffers.columns),
+    }
+    ranges = list(zip(cuts[:-1], cuts[1:]))
+
+    # an empty dataset is one empty partition; no point starting a pool
+    if workers <= 1 or not len(buffers):
+        partials = [_map_all(arrays, start, stop, settings) for start, stop in ranges]
+    else:
+        with SharedArrays() as shared:
+            descriptors = {name: shared.share(values) for name, values in arrays.items()}
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_map_shared, descriptors, start, stop, settings)
+                           for start, stop in ranges]
+                partials = [future.result() for future in futures]
+
+    results = {}
+    for name in questions:
+        question = QUESTIONS[name]
+        combined = partials[0][name]
+        for partial in partials[1:]:
+            combined = question.combine(combined, partial[name])
+        results[name] = question.finish(combined, buffers)
+    return results
@@ -0,0 +1,71 @@
+"""Data reduction for plots of large datasets.
+
+Scatter and swarm plots draw one marker per movie, which stops working at
+catalog scale (swarm placement is roughly quadratic).  Above a row
+threshold these helpers return aggregated or sampled arrays instead:
+
+* ``reduce_scatter``: the raw points, or a 2-D histogram of them,
+* ``reduce_swarm``: the raw values, or a density-preserving sample,
+* ``histogram_bins``: precomputed ``plt.hist`` counts and edges.
+
+Every result is a dict of NumPy arrays, so it can be cached with
+``np.savez`` and passed straight to ``tmdb.figures`` as spec data.
+"""
+
+import numpy as np
+
+SCATTER_THRESHOLD = 50_000
+SWARM_THRESHOLD = 2_000
+
+
+def _finite(*arrays):
+    arrays = [np.asarray(a, dtype='float64') for a in arrays]
+    keep = np.ones(len(arrays[0]), dtype=bool)
+    for array in arrays:
+        keep &= np.isfinite(array)
+    return [array[keep] for array in arrays]
+
+
+def reduce_scatter(x, y, threshold=SCATTER_THRESHOLD, bins=200):
+    """Points ``{'x', 'y'}``, or ``{'counts', 'xedges', 'yedges'}`` above ``threshold``.
+
+    Pairs with a missing value are dropped in both cases.
+    """
+    x, y = _finite(x, y)
+    if len(x) <= threshold:
+        return {'x': x, 'y': y}
+    counts, xedges, yedges = np.histogram2d(x, y, bins=bins)
+    return {'counts': counts, 'xedges': xedges, 'yedges': yedges}
+
+
+def reduce_swarm(values, threshold=SWARM_THRESHOLD, bins=100, seed=0):
+    """``{'values'}``, sampled down to about ``threshold`` values if larger.
+
+    The sample is stratified over ``bins`` equal-width bins, so every bin
+    keeps its share of the points, and always includes the minimum and
+    maximum so the plotted range is unchanged.
+    """
+    (values,) = _finite(values)
+    if len(values) <= threshold:
+        return {'values': values}
+
+    rng = np.random.default_rng(seed)
+    edges = np.histogram_bin_edges(values, bins=bins)
+    which = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, bins - 1)
+    order = np.argsort(which, kind='stable')
+    starts = np.searchsorted(which[order], np.arange(bins))
+    counts = np.diff(np.append(starts, len(values)))
+    quota = np.round(counts * (threshold / len(values))).astype(np.int64)
+    quota = np.minimum(np.maximum(quota, counts > 0), counts)
+
+    chosen = [order[start + rng.choice(count, size=take, replace=False)]
+              for start, count, take in zip(starts, counts, quota) if take]
+    chosen.append([values.argmin(), values.argmax()])
+    return {'values': values[np.unique(np.concatenate(chosen))]}
+
+
+def histogram_bins(values, bins=35):
+    """``{'counts', 'edges'}`` of ``values``, skipping missing values."""
+    (values,) = _finite(values)
+    counts, edges = np.histogram(values, bins=bins)
+    return {'counts': counts, 'edges': edges}
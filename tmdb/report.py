@@ -0,0 +1,116 @@
+"""Headless run of the notebook: wrangling, research questions, outputs.
+
+``run_report`` loads and cleans the CSV, answers research questions 1-9
+and writes the results to an output directory: every table as JSON (and
+Parquet when asked for), the scalar answers in ``summary.json`` and the
+figures as PNG files under ``figures/``.  Unlike the notebook it does not
+need IPython and does not round-trip through nbconvert.
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from tmdb.correlation import correlation, pair_correlation
+from tmdb.dataset import MovieDataset
+
+MONEY_AND_RUNTIME = ('budget', 'revenue', 'profit', 'runtime')
+
+
+def research_questions(movies):
+    """Answer the notebook's research questions for a ``MovieDataset``.
+
+    Returns a dict of tables (DataFrame/Series) and scalars.
+    """
+    frame = movies.frame
+    derived = movies.derived()
+    results = {}
+
+    # Questions 1-4: highest and lowest budget, revenue, profit and runtime
+    movie_extremes = movies.extremes(MONEY_AND_RUNTIME)
+    results['extremes'] = movie_extremes.to_frame()
+    for column in MONEY_AND_RUNTIME:
+        results['{}_extremes'.format(column)] = movies.rows(list(movie_extremes.positions(column)))
+
+    results['runtime_revenue_correlation'] = float(pair_correlation(frame, 'runtime', 'revenue'))
+
+    # Question 5: properties of movies with a profit of $50M or more
+    results['profitable_movies'] = len(movies.profitable())
+    results['profitable_genres'] = movies.data('genres')
+    results['profitable_cast'] = movies.data('cast')
+    for column in ('budget', 'revenue', 'runtime'):
+        results['profitable_average_{}'.format(column)] = float(movies.profit_avg(column))
+    numeric = list(frame.select_dtypes('number').columns)
+    numeric.insert(numeric.index('revenue') + 1, 'profit')
+    results['correlation_matrix'] = correlation(derived, numeric)
+
+    # Questions 6 and 7: runtime
+    results['average_runtime'] = float(movies.avg('runtime'))
+    results['runtime_describe'] = frame['runtime'].describe()
+
+    # Question 8: most profitable year
+    profits_by_year = movies.yearly(MONEY_AND_RUNTIME).sum('profit')
+    results['profits_by_year'] = profits_by_year
+    results['most_profitable_year'] = int(profits_by_year.idxmax())
+    results['most_profitable_year_profit'] = float(profits_by_year.max())
+
+    # Question 9: most popular genre per year
+    results['most_popular_genres'] = movies.genre_counts().most_popular()
+
+    return results
+
+
+def _table(value):
+    if isinstance(value, pd.Series):
+        value = value.to_frame()
+    # parquet and JSON both want string column names
+    value = value.copy()
+    value.columns = [str(column) for column in value.columns]
+    return value
+
+
+def write_results(results, out_dir, formats=('json',)):
+    """Write tables as ``<name>.json``/``<name>.parquet`` and scalars to ``summary.json``."""
+    os.makedirs(out_dir, exist_ok=True)
+    summary = {}
+    written = []
+    for name, value in results.items():
+        if not isinstance(value, (pd.DataFrame, pd.Series)):
+            summary[name] = value
+            continue
+        table = _table(value)
+        if 'json' in formats:
+            path = os.path.join(out_dir, name + '.json')
+            table.to_json(path, orient='split', date_format='iso', default_handler=str)
+            written.append(path)
+        if 'parquet' in formats:
+            path = os.path.join(out_dir, name + '.parquet')
+            table.to_parquet(path)
+            written.append(path)
+
+    path = os.path.join(out_dir, 'summary.json')
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
+    written.append(path)
+    return written
+
+
+def run_report(path='tmdb-movies.csv', out_dir='report', figures=True, formats=('json',), cached=True,
+               workers=None):
+    """Run the whole analysis on ``path`` and write it to ``out_dir``.
+
+    Figures are rendered on ``workers`` processes (default: one per core).
+    Returns the list of files written.
+    """
+    movies = MovieDataset.load(path, cached=cached)
+    results = research_questions(movies)
+    written = write_results(results, out_dir, formats)
+
+    if figures:
+        # imported here so a run without figures never loads matplotlib
+        from tmdb import figures as figure_module
+        specs = figure_module.figure_specs(results, movies.frame)
+        written += figure_module.render_all(specs, os.path.join(out_dir, 'figures'), workers=workers)
+
+    return written
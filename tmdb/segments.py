@@ -0,0 +1,197 @@
+"""Row subsets as selection vectors over one frame.
+
+``df[df['profit'] >= 50_000_000]`` copies every column of the selected rows,
+although the analyses only read one or two of them.  A ``Segment`` is a
+boolean vector over the rows of a frame instead.  Segments of the same frame
+combine with ``&``, ``|`` and ``~``, and reduce without building a new
+DataFrame:
+
+* ``sum``/``mean``/``count`` use ``where=`` reductions over the full column,
+* ``top_k`` only gathers the selected values of one column,
+* ``token_counts`` counts '|'-separated values through ``tmdb.tokens``.
+
+Segments are made by a ``Segments`` factory, which converts each column to
+an array (and tokenizes each '|' column) once for all its segments::
+
+    segments = Segments(df)
+    profitable = segments.between('profit', 50_000_000)
+    recent = segments.years(2000, 2015)
+    (profitable & recent).mean('budget')
+"""
+
+import numpy as np
+import pandas as pd
+
+from tmdb.columns import column_values
+from tmdb.extremes import top_k_positions
+from tmdb.tokens import tokenize
+
+
+class Segments:
+    """Factory of segments over ``frame``, with per-column array caches.
+
+    ``derived`` (a ``tmdb.derived.DerivedColumns``) lets segments select on
+    and reduce derived columns such as ``roi``.
+    """
+
+    def __init__(self, frame, derived=None):
+        self.frame = frame
+        self.derived = derived
+        self._values = {}
+        self._tokens = {}
+        self._incidence = {}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def values(self, column):
+        """``column`` as an int64 (plain integers) or float64 array, NaN for missing."""
+        if self.derived is not None and column in self.derived:
+            return self.derived[column]
+        if column not in self._values:
+            self._values[column] = column_values(self.frame[column])
+        return self._values[column]
+
+    def tokens(self, column):
+        """``tmdb.tokens.Tokens`` of the '|'-separated ``column``."""
+        if column not in self._tokens:
+            self._tokens[column] = tokenize(self.frame[column])
+        return self._tokens[column]
+
+    def incidence(self, column):
+        """``tmdb.incidence.Incidence`` of the '|'-separated ``column`` (needs scipy)."""
+        if column not in self._incidence:
+            from tmdb.incidence import Incidence
+            self._incidence[column] = Incidence.from_tokens(self.tokens(column), self)
+        return self._incidence[column]
+
+    def of(self, mask, name=None):
+        """Segment of the rows where the boolean ``mask`` is true."""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(self.frame),):
+            raise ValueError('mask has {} rows, the frame {}'.format(mask.shape, len(self.frame)))
+        return Segment(self, mask, name)
+
+    def rows(self, positions, name=None):
+        """Segment of the rows at ``positions``, e.g. from ``tmdb.invindex``."""
+        mask = np.zeros(len(self.frame), dtype=bool)
+        mask[np.asarray(positions, dtype=np.intp)] = True
+        return Segment(self, mask, name)
+
+    def all(self):
+        return self.of(np.ones(len(self.frame), dtype=bool), 'all')
+
+    def between(self, column, low=None, high=None):
+        """Rows with ``low <= column < high``; either bound may be omitted."""
+        values = self.values(column)
+        mask = ~np.isnan(values) if values.dtype.kind == 'f' else np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values < high
+        name = column
+        if low is not None:
+            name = '{} <= {}'.format(low, name)
+        if high is not None:
+            name = '{} < {}'.format(name, high)
+        return self.of(mask, name)
+
+    def years(self, first, last=None, column='release_year'):
+        """Rows released in ``first`` through ``last``, e.g. a decade."""
+        last = first if last is None else last
+        return self.between(column, first, last + 1)
+
+    def isin(self, column, values):
+        """Rows whose ``column`` is one of ``values``, e.g. a set of directors."""
+        return self.of(self.frame[column].isin(values).to_numpy(dtype=bool), '{} in {}'.format(column, values))
+
+    def token(self, column, value):
+        """Rows whose '|'-separated ``column`` contains ``value``, e.g. a genre."""
+        tokens = self.tokens(column)
+        mask = np.zeros(len(self.frame), dtype=bool)
+        matches = np.flatnonzero(tokens.vocabulary == value)
+        if len(matches):
+            mask[tokens.row_ids()[tokens.codes == matches[0]]] = True
+        return self.of(mask, '{} has {}'.format(column, value))
+
+
+class Segment:
+    """The rows of ``segments.frame`` where ``mask`` is true."""
+
+    def __init__(self, segments, mask, name=None):
+        self.segments = segments
+        self.mask = mask
+        self.name = name
+        self._positions = None
+
+    def _other(self, other):
+        if other.segments is not self.segments:
+            raise ValueError('cannot combine segments of different frames')
+        return other.mask
+
+    def __and__(self, other):
+        return Segment(self.segments, self.mask & self._other(other), '({}) & ({})'.format(self.name, other.name))
+
+    def __or__(self, other):
+        return Segment(self.segments, self.mask | self._other(other), '({}) | ({})'.format(self.name, other.name))
+
+    def __invert__(self):
+        return Segment(self.segments, ~self.mask, '~({})'.format(self.name))
+
+    def __len__(self):
+        return int(np.count_nonzero(self.mask))
+
+    def __repr__(self):
+        return '<Segment {}: {} of {} rows>'.format(self.name, len(self), len(self.mask))
+
+    @property
+    def positions(self):
+        """Row positions of the segment, in frame order."""
+        if self._positions is None:
+            self._positions = np.flatnonzero(self.mask)
+        return self._positions
+
+    def _present(self, values):
+        return self.mask & ~np.isnan(values) if values.dtype.kind == 'f' else self.mask
+
+    def count(self, column=None):
+        """Rows in the segment, or its non-missing values of ``column``."""
+        if column is None:
+            return len(self)
+        return int(np.count_nonzero(self._present(self.segments.values(column))))
+
+    def sum(self, column):
+        values = self.segments.values(column)
+        return np.add.reduce(values, where=self._present(values))
+
+    def mean(self, column):
+        """Mean of the non-missing values of ``column``; NaN when there are none."""
+        count = self.count(column)
+        return self.sum(column) / count if count else np.nan
+
+    def top_k(self, column, k=100, largest=True):
+        """Frame positions of the ``k`` largest (or smallest) values of ``column``."""
+        positions = self.positions
+        return positions[top_k_positions(self.segments.values(column)[positions], k, largest)]
+
+    def token_counts(self, column):
+        """Counts of the '|'-separated values of ``column`` in the segment.
+
+        Same as ``tokenize(segment_frame[column]).value_counts()``: descending
+        counts, ties in order of first appearance within the segment.
+        """
+        tokens = self.segments.tokens(column)
+        codes = tokens.codes[self.mask[tokens.row_ids()]]
+        counts = np.bincount(codes, minlength=len(tokens.vocabulary))
+        seen, first = np.unique(codes, return_index=True)
+        order = seen[np.lexsort((first, -counts[seen]))]
+        return pd.Series(counts[order], index=pd.Index(tokens.vocabulary[order]), name='count')
+
+    def frame(self, columns=None):
+        """The segment as a DataFrame (a copy), optionally only ``columns``."""
+        frame = self.segments.frame if columns is None else self.segments.frame[columns]
+        return frame.iloc[self.positions]
+
+    def head(self, n=5):
+        """First ``n`` rows of the segment, copying only those rows."""
+        return self.segments.frame.iloc[self.positions[:n]]
@@ -0,0 +1,314 @@
+"""JSON query service over the cleaned dataset, on plain asyncio.
+
+``QueryService`` loads and cleans the CSV once (through the Arrow cache),
+opens the cast/director inverted indexes and answers the research
+questions as JSON:
+
+==========================  ==============================================
+``/health``                 dataset version and row count
+``/extremes?column=...``    highest and lowest budget/revenue/profit/runtime
+``/averages``               average budget, revenue, runtime (question 5-6)
+``/profits-by-year``        total profit per release year
+``/most-profitable-year``   year with the highest total profit
+``/top-genres?k=10``        genres most common among profitable movies
+``/top-cast?k=10``          cast most common among profitable movies
+``/popular-genres``         most popular genre of every year
+``/movies?cast=..&cast=..`` movies with all the given cast (and ``director``)
+==========================  ==============================================
+
+Answers are computed on a thread pool, which only keeps the event loop
+responsive: it goes on accepting connections and serving cached answers
+while a cold question is computed.  It does not add CPU parallelism.
+Tokenizing, ``str.split``, ``to_json``, Space-Saving and building
+``Segments``/``DerivedColumns`` are Python-level and hold the GIL, so
+cold questions mostly run one at a time; only numpy reductions overlap.
+The threads share the one in-memory dataset, and every answer is cached,
+so each question pays that cost once per dataset version.
+
+The encoded responses are cached per dataset version: after
+``MovieDataset.changed`` the next request recomputes.  Identical requests
+that arrive while one is being computed wait for it instead of computing
+again.
+
+The HTTP layer is a minimal HTTP/1.1 implementation (GET only,
+keep-alive) on ``asyncio.start_server``, so the service runs and can be
+load-tested locally without any external server or framework.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from tmdb.dataset import LRUCache, MovieDataset
+from tmdb.report import MONEY_AND_RUNTIME
+
+MOVIE_COLUMNS = ['original_title', 'director', 'release_year', 'budget', 'revenue', 'profit', 'runtime']
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _records(frame):
+    """``frame`` as a list of JSON-ready dicts (NaN/NA become null)."""
+    return json.loads(frame.to_json(orient='records', date_format='iso', default_handler=str))
+
+
+def _movies(movies, positions):
+    rows = movies.rows(positions)
+    return _records(rows[[c for c in MOVIE_COLUMNS if c in rows]].reset_index(names='id'))
+
+
+def _int(query, name, default):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise HTTPError(400, '{} must be a non-negative integer'.format(name))
+    return value
+
+
+class QueryService:
+    """Research-question endpoints over a ``MovieDataset``.
+
+    ``indexes`` maps column names (``cast``, ``director``) to
+    ``tmdb.invindex.InvertedIndex``; missing ones are built on first use.
+    ``workers`` threads compute answers off the event loop; they share the
+    GIL, so they keep the loop responsive rather than run cold questions
+    in parallel.
+    """
+
+    def __init__(self, movies, indexes=None, workers=4, cache_size=1024):
+        self.movies = movies
+        self.indexes = dict(indexes or {})
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tmdb-query')
+        self._responses = LRUCache(cache_size)
+        self._pending = {}
+        self.routes = {
+            '/health': self.health,
+            '/extremes': self.extremes,
+            '/averages': self.averages,
+            '/profits-by-year': self.profits_by_year,
+            '/most-profitable-year': self.most_profitable_year,
+            '/top-genres': self.top_genres,
+            '/top-cast': self.top_cast,
+            '/popular-genres': self.popular_genres,
+            '/movies': self.movies_with,
+        }
+
+    @classmethod
+    def load(cls, path='tmdb-movies.csv', cached=True, **kwargs):
+        """Load the cleaned dataset and its cast/director indexes."""
+        movies = MovieDataset.load(path, cached=cached)
+        indexes = {}
+        if cached:
+            from tmdb.invindex import INDEX_COLUMNS, cached_index
+            for column in INDEX_COLUMNS:
+                indexes[column] = cached_index(path, column, frame=movies.frame)
+        return cls(movies, indexes, **kwargs)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    # --- endpoints; each returns a JSON-ready object
+
+    def health(self, query):
+        return {'status': 'ok', 'version': self.movies.version, 'rows': len(self.movies.frame)}
+
+    def extremes(self, query):
+        columns = query.get('column', list(MONEY_AND_RUNTIME))
+        unknown = sorted(set(columns) - set(MONEY_AND_RUNTIME))
+        if unknown:
+            raise HTTPError(400, 'unknown column(s): {}'.format(', '.join(unknown)))
+        found = self.movies.extremes(MONEY_AND_RUNTIME)
+        answer = {}
+        for column in columns:
+            high, low = found.argmax[column], found.argmin[column]
+            answer[column] = {
+                'highest': _movies(self.movies, [high])[0] if high >= 0 else None,
+                'lowest': _movies(self.movies, [low])[0] if low >= 0 else None,
+            }
+        return answer
+
+    def averages(self, query):
+        movies = self.movies
+        return {
+            'profit_threshold': movies.profit_threshold,
+            'profitable_movies': len(movies.profitable()),
+            'profitable': {column: float(movies.profit_avg(column)) for column in ('budget', 'revenue', 'runtime')},
+            'all': {column: float(movies.avg(column)) for column in ('budget', 'revenue', 'runtime')},
+        }
+
+    def profits_by_year(self, query):
+        profits = self.movies.yearly(MONEY_AND_RUNTIME).sum('profit')
+        return {str(year): int(total) for year, total in profits.items()}
+
+    def most_profitable_year(self, query):
+        profits = self.movies.yearly(MONEY_AND_RUNTIME).sum('profit')
+        return {'year': int(profits.idxmax()), 'profit': int(profits.max())}
+
+    def _top(self, column, query):
+        counts = self.movies.data(column).head(_int(query, 'k', 10))
+        return [{column: name, 'count': int(count)} for name, count in counts.items()]
+
+    def top_genres(self, query):
+        return self._top('genres', query)
+
+    def top_cast(self, query):
+        return self._top('cast', query)
+
+    def popular_genres(self, query):
+        return _records(self.movies.genre_counts().most_popular())
+
+    def index(self, column):
+        if column not in self.indexes:
+            self.indexes[column] = self.movies.inverted_index(column)
+        return self.indexes[column]
+
+    def movies_with(self, query):
+        """Movies featuring every ``cast`` and ``director`` given, with totals."""
+        positions = None
+        for column in ('cast', 'director'):
+            names = query.get(column, [])
+            if names:
+                rows = self.index(column).all_of(*names)
+                positions = rows if positions is None else np.intersect1d(positions, rows)
+        if positions is None:
+            raise HTTPError(400, 'give at least one cast or director')
+        segment = self.movies.segments().rows(positions)
+        return {
+            'count': len(segment),
+            'revenue': int(segment.sum('revenue')),
+            'profit': int(segment.sum('profit')),
+            'movies': _movies(self.movies, positions[:_int(query, 'limit', 100)]),
+        }
+
+    # --- dispatch
+
+    def _compute(self, route, query):
+        return json.dumps(route(query), allow_nan=False, default=_json_default).encode()
+
+    async def respond(self, target):
+        """(status, body bytes) for the request target ``target``."""
+        url = urlsplit(target)
+        route = self.routes.get(url.path)
+        if route is None:
+            return 404, _error('no such endpoint: {}'.format(url.path))
+        query = parse_qs(url.query)
+        key = (url.path, tuple(sorted((name, tuple(values)) for name, values in query.items())), self.movies.version)
+
+        try:
+            return 200, self._responses.lookup(key)
+        except KeyError:
+            pass
+
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(self.executor, self._compute, route, query)
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        try:
+            body = await asyncio.shield(pending)
+        except HTTPError as exc:
+            return exc.status, _error(str(exc))
+        except Exception as exc:  # report, keep serving
+            return 500, _error('{}: {}'.format(type(exc).__name__, exc))
+        self._responses.put(key, body)
+        return 200, body
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError('{!r} is not JSON serializable'.format(value))
+
+
+def _error(message):
+    return json.dumps({'error': message}).encode()
+
+
+async def _handle(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                status, body, keep_alive = 400, _error('malformed request line'), False
+            else:
+                method, target, version = parts
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    length = int(headers.get('content-length') or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # the body cannot be skipped, so the connection cannot be reused
+                    length, keep_alive = None, False
+                if length:
+                    await reader.readexactly(length)
+                if length is None:
+                    status, body = 400, _error('invalid Content-Length')
+                elif method != 'GET':
+                    status, body = 405, _error('only GET is supported')
+                else:
+                    status, body = await service.respond(target)
+
+            writer.write(
+                'HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n'
+                'Connection: {}\r\n\r\n'.format(
+                    status, _REASONS[status], len(body), 'keep-alive' if keep_alive else 'close',
+                ).encode() + body
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service, host='127.0.0.1', port=8000):
+    """Start serving ``service``; returns the ``asyncio.Server``."""
+    return await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port)
+
+
+def serve(path='tmdb-movies.csv', host='127.0.0.1', port=8000, workers=4, cached=True):
+    """Load ``path`` and serve it until interrupted."""
+    service = QueryService.load(path, cached=cached, workers=workers)
+
+    async def main():
+        server = await start_server(service, host, port)
+        bound_host, bound_port = server.sockets[0].getsockname()[:2]
+        print('serving {} rows on http://{}:{}'.format(len(service.movies.frame), bound_host, bound_port), flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,83 @@
+"""NumPy arrays in shared memory for process-pool workers.
+
+The parent copies each array once into a ``SharedMemory`` block and sends
+workers a small ``SharedArray`` descriptor instead of pickling the data;
+workers map the block with ``attach`` and read it in place.
+"""
+
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+SharedArray = namedtuple('SharedArray', ['name', 'shape', 'dtype'])
+
+
+class SharedArrays:
+    """Owner of the shared blocks created for one batch of work.
+
+    Use as a context manager: blocks are unlinked on exit.
+    """
+
+    def __init__(self):
+        self._blocks = []
+
+    def share(self, array):
+        """Copy ``array`` into a new shared block and return its descriptor."""
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise TypeError('only numeric arrays can be shared, got {}'.format(array.dtype))
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._blocks.append(block)
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        return SharedArray(block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _open(name):
+    try:
+        # the parent owns the block; don't let this process's resource
+        # tracker unlink it (Python 3.13+)
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class Attached:
+    """Arrays mapped from ``SharedArray`` descriptors inside a worker.
+
+    Use as a context manager; the mappings are closed on exit.
+    """
+
+    def __init__(self, descriptors):
+        self._blocks = []
+        self.arrays = {}
+        for key, descriptor in descriptors.items():
+            block = _open(descriptor.name)
+            self._blocks.append(block)
+            self.arrays[key] = np.ndarray(descriptor.shape, np.dtype(descriptor.dtype), buffer=block.buf)
+
+    def __enter__(self):
+        return self.arrays
+
+    def __exit__(self, *exc_info):
+        self.arrays = {}
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                # something (e.g. a matplotlib artist) still holds a view;
+                # the mapping goes away with the worker
+                pass
+        self._blocks = []
@@ -0,0 +1,168 @@
+"""Single-pass, mergeable ``describe()`` for runtime and money columns.
+
+``ColumnSketch`` keeps exact count, mean, standard deviation (merged with
+Chan's parallel formulas), min and max, plus a merging t-digest for
+quantiles.  Each chunk or partition is summarised on its own and the
+sketches are merged afterwards; memory is O(compression) regardless of
+the number of rows.
+
+The t-digest compresses sorted centroids by bucketing them on the k1
+scale function (k = compression / 2pi * asin(2q - 1)), which keeps
+clusters small near the tails.  As in the merging digest, a centroid
+whose size bound (4 n q (1 - q) / compression) is below two values is
+never merged, so roughly the compression / 2 smallest and largest values
+stay exact singletons and tail quantiles are interpolated between them.
+Compression is vectorized: one sort and a ``reduceat`` per batch.
+
+Sketches also produce boxplot statistics and histogram counts, so the
+runtime figures can be drawn without the raw column.
+"""
+
+import numpy as np
+import pandas as pd
+
+from tmdb.columns import float_column
+
+DEFAULT_COMPRESSION = 200
+
+
+class ColumnSketch:
+    """Moments and a t-digest of one numeric column."""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, name=None):
+        self.compression = compression
+        self.name = name
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+
+    @classmethod
+    def of(cls, values, chunksize=1_000_000, compression=DEFAULT_COMPRESSION):
+        """Sketch ``values`` (Series or array), ``chunksize`` values at a time."""
+        sketch = cls(compression, getattr(values, 'name', None))
+        for start in range(0, len(values), chunksize):
+            sketch.update(values[start:start + chunksize])
+        return sketch
+
+    def _combine_moments(self, count, mean, m2):
+        total = self.count + count
+        if not total:
+            return
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        """Add ``values``; missing values are skipped."""
+        values = float_column(values)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        mean = values.mean()
+        self._combine_moments(len(values), mean, float(((values - mean) ** 2).sum()))
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        """Fold ``other`` (e.g. another partition's sketch) into this one."""
+        if not other.count:
+            return
+        self._combine_moments(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+        total = weights.sum()
+        cumulative = np.cumsum(weights)
+        middle = (cumulative - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * middle - 1)
+        buckets = np.floor(k).astype(np.int64)
+        single = 4 * total * middle * (1 - middle) / self.compression < 2
+        starts = np.flatnonzero(np.r_[True, (buckets[1:] != buckets[:-1]) | single[1:] | single[:-1]])
+        bucket_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / bucket_weights
+        self.weights = bucket_weights
+
+    def _cumulative(self):
+        """Knots (value, rank) for interpolating between centroids."""
+        centres = np.cumsum(self.weights) - self.weights / 2
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        ranks = np.concatenate([[0.0], centres, [float(self.count)]])
+        return values, ranks
+
+    def quantile(self, q):
+        """Approximate quantile(s) ``q`` in [0, 1]."""
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        values, ranks = self._cumulative()
+        return np.interp(np.asarray(q, dtype='float64') * self.count, ranks, values)
+
+    def cdf(self, x):
+        """Approximate fraction of values <= ``x``."""
+        values, ranks = self._cumulative()
+        return np.interp(np.asarray(x, dtype='float64'), values, ranks) / self.count
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def describe(self):
+        """Same layout as ``Series.describe()``; quartiles are approximate."""
+        empty = not self.count
+        q1, median, q3 = self.quantile([0.25, 0.5, 0.75])
+        return pd.Series({
+            'count': float(self.count),
+            'mean': np.nan if empty else self.mean,
+            'std': self.std,
+            'min': np.nan if empty else self.min,
+            '25%': q1,
+            '50%': median,
+            '75%': q3,
+            'max': np.nan if empty else self.max,
+        }, name=self.name)
+
+    def boxplot_stats(self, whis=1.5):
+        """``{'stats', 'fliers'}`` for ``tmdb.figures.boxplot_from_stats``.
+
+        ``stats`` is [whislo, q1, median, q3, whishi, mean]; whiskers end at
+        ``whis`` IQRs (clipped to the data range).  Only the min and max can
+        be shown as fliers, since individual values are not kept.
+        """
+        q1, median, q3 = self.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        low = max(self.min, q1 - whis * iqr)
+        high = min(self.max, q3 + whis * iqr)
+        fliers = [value for value in (self.min, self.max) if value < low or value > high]
+        return {
+            'stats': np.array([low, q1, median, q3, high, self.mean]),
+            'fliers': np.array(fliers, dtype='float64'),
+        }
+
+    def histogram(self, bins=35):
+        """``{'counts', 'edges'}`` like ``tmdb.reduce.histogram_bins``, from the digest."""
+        if not self.count:
+            return {'counts': np.zeros(bins), 'edges': np.linspace(0, 1, bins + 1)}
+        edges = np.linspace(self.min, self.max, bins + 1)
+        counts = np.diff(self.cdf(edges)) * self.count
+        counts[0] += self.cdf(edges[0]) * self.count
+        return {'counts': counts, 'edges': edges}
+
+
+def sketch_describe(chunks, column, compression=DEFAULT_COMPRESSION):
+    """``describe()`` of ``column`` over an iterable of chunks, in one pass."""
+    sketch = ColumnSketch(compression, column)
+    for chunk in chunks:
+        sketch.update(chunk[column])
+    return sketch.describe()
@@ -0,0 +1,100 @@
+"""Chunked cleaning and aggregation for catalogs larger than memory.
+
+``iter_clean_chunks`` reads the CSV with ``chunksize`` and yields cleaned
+chunks.  Duplicate rows are removed across chunks by keeping a 64-bit
+digest of every row seen so far, so the only state that grows with the
+dataset is 8 bytes per distinct row.  The accumulators consume cleaned
+chunks and hold per-year totals and the current extreme rows only.
+"""
+
+import pandas as pd
+
+from tmdb.cleaning import CLEANING_CONFIG, clean_values
+from tmdb.dedup import DigestSet, dedup_batch
+from tmdb.loader import load_movies
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def iter_clean_chunks(path='tmdb-movies.csv', chunksize=DEFAULT_CHUNKSIZE, config=CLEANING_CONFIG):
+    """Yield cleaned chunks of ``path``.
+
+    Each chunk goes through the same steps as ``clean_movies``: column
+    pruning and date parsing in the reader, duplicate removal (against every
+    earlier chunk too) and ``clean_values``.  Chunks keep the row labels a
+    full ``load_movies`` would give them.
+    """
+    seen = DigestSet()
+    for chunk in load_movies(path, usecols=config['usecols'], chunksize=chunksize):
+        chunk = clean_values(dedup_batch(chunk, seen, config['duplicate_subset']), config)
+        if len(chunk):
+            yield chunk
+
+
+class YearlySums:
+    """Running ``groupby('release_year')[column].sum()`` over chunks."""
+
+    def __init__(self, column='profit'):
+        self.column = column
+        self._totals = {}
+
+    def update(self, chunk):
+        partial = chunk.groupby('release_year')[self.column].sum()
+        for year, total in partial.items():
+            self._totals[year] = self._totals.get(year, 0) + total
+
+    def result(self):
+        totals = pd.Series(self._totals, name=self.column)
+        totals.index.name = 'release_year'
+        return totals.sort_index()
+
+
+class RunningExtremes:
+    """Rows holding the highest and lowest value of each column so far.
+
+    Ties keep the earliest row, as ``idxmax``/``idxmin`` do.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._high = {}
+        self._low = {}
+
+    def update(self, chunk):
+        for column in self.columns:
+            values = chunk[column]
+            if not values.notna().any():
+                continue
+            high = chunk.loc[values.idxmax()]
+            low = chunk.loc[values.idxmin()]
+            if column not in self._high or high[column] > self._high[column][column]:
+                self._high[column] = high
+            if column not in self._low or low[column] < self._low[column][column]:
+                self._low[column] = low
+
+    def calculate(self, column):
+        """Same layout as the notebook's ``calculate``: highest row, then lowest."""
+        return pd.concat([self._high[column].to_frame(), self._low[column].to_frame()], axis=1)
+
+
+def stream_analysis(path='tmdb-movies.csv', chunksize=DEFAULT_CHUNKSIZE, config=CLEANING_CONFIG):
+    """Clean ``path`` chunk by chunk and accumulate the notebook's aggregates.
+
+    Returns a dict with the cleaned row count, ``profits_by_year`` and a
+    ``RunningExtremes`` over budget, revenue, profit and runtime.
+    """
+    rows = 0
+    profits_by_year = YearlySums('profit')
+    extremes = RunningExtremes(['budget', 'revenue', 'profit', 'runtime'])
+
+    for chunk in iter_clean_chunks(path, chunksize, config):
+        chunk.insert(2, 'profit', chunk['revenue'] - chunk['budget'])
+        rows += len(chunk)
+        profits_by_year.update(chunk)
+        extremes.update(chunk)
+
+    return {
+        'rows': rows,
+        'profits_by_year': profits_by_year.result(),
+        'extremes': extremes,
+    }
@@ -0,0 +1,100 @@
+"""A sorted release-date index for time-range queries.
+
+``TimeIndex.build`` sorts the frame once by ``(release_year, release_date)``
+and records where every year starts.  A date range is then two
+``searchsorted`` calls -- one in the block of the first year, one in the
+block of the last -- and the rows between are a single ``slice``, so
+``between`` returns ``iloc`` views instead of boolean-mask copies.  Per-year
+aggregations read the year offsets directly instead of grouping again.
+
+``release_year`` decides which year a movie belongs to and ``release_date``
+only orders movies within their year, so a date whose century was guessed
+wrong (``%y`` maps 1966 to 2066) still lands in the right year.
+"""
+
+import numpy as np
+import pandas as pd
+
+from tmdb.yearly import YearlyAggregates
+
+
+class TimeIndex:
+    """A frame sorted by release year and date, with per-year offsets.
+
+    Rows of ``years[i]`` are ``frame.iloc[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, frame, years, offsets, dates, date='release_date', year='release_year'):
+        self.frame = frame
+        self.years = years
+        self.offsets = offsets
+        self.dates = dates
+        self.date = date
+        self.year = year
+
+    @classmethod
+    def build(cls, df, date='release_date', year='release_year'):
+        """Sort ``df`` by ``year`` then ``date`` (stable) and index it."""
+        dates = pd.to_datetime(df[date]).to_numpy(dtype='datetime64[ns]')
+        years = np.asarray(df[year], dtype=np.int64)
+        order = np.lexsort((dates, years))
+        if (np.diff(order) < 0).any():
+            df = df.iloc[order]
+            dates, years = dates[order], years[order]
+        unique_years, starts = np.unique(years, return_index=True)
+        offsets = np.append(starts, len(years)).astype(np.int64)
+        return cls(df, unique_years, offsets, dates, date, year)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def year_slice(self, first, last=None):
+        """Positions of the movies released in ``first`` through ``last``."""
+        last = first if last is None else last
+        lo = np.searchsorted(self.years, first, side='left')
+        hi = np.searchsorted(self.years, last, side='right')
+        return slice(int(self.offsets[lo]), int(self.offsets[hi]))
+
+    def date_slice(self, start, end):
+        """Positions of the movies released from ``start`` to ``end`` inclusive."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if end < start:
+            return slice(0, 0)
+        lo = self._position(start, 'left')
+        hi = self._position(end, 'right')
+        return slice(lo, max(lo, hi))
+
+    def _position(self, when, side):
+        block = np.searchsorted(self.years, when.year)
+        if block == len(self.years) or self.years[block] != when.year:
+            # no movies that year: the range starts/ends between year blocks
+            return int(self.offsets[block])
+        start, stop = self.offsets[block], self.offsets[block + 1]
+        within = np.searchsorted(self.dates[start:stop], np.datetime64(when, 'ns'), side=side)
+        return int(start + within)
+
+    def between(self, start, end):
+        """Rows released from ``start`` to ``end`` inclusive, as a view."""
+        return self.frame.iloc[self.date_slice(start, end)]
+
+    def in_years(self, first, last=None):
+        """Rows released in ``first`` through ``last``, as a view."""
+        return self.frame.iloc[self.year_slice(first, last)]
+
+    def values(self, column, start=None, end=None):
+        """``column`` as an array, optionally restricted to a date range.
+
+        An omitted ``start`` or ``end`` leaves that side of the range open.
+        """
+        values = self.frame[column].to_numpy()
+        lo = 0 if start is None else self._position(pd.Timestamp(start), 'left')
+        hi = len(self) if end is None else self._position(pd.Timestamp(end), 'right')
+        return values[lo:max(lo, hi)]
+
+    def sum(self, column, start, end):
+        """Sum of ``column`` over the movies released from ``start`` to ``end``."""
+        return self.frame[column].iloc[self.date_slice(start, end)].sum()
+
+    def yearly(self, columns):
+        """``YearlyAggregates`` of ``columns`` from the year offsets, without re-sorting."""
+        return YearlyAggregates.from_sorted(self.frame, self.years, self.offsets[:-1], columns, self.year)
@@ -0,0 +1,115 @@
+"""CSR-style tokenizer for pipe-delimited columns such as genres and cast.
+
+``tokenize`` turns a column like ``'Action|Adventure|Thriller'`` into
+
+* ``codes``: one integer per token, indexing into ``vocabulary``,
+* ``offsets``: row ``i`` owns ``codes[offsets[i]:offsets[i + 1]]``,
+* ``vocabulary``: the distinct tokens, in order of first appearance.
+
+Counting, exploding and joining then work on the integer codes instead of
+a joined giant string or a wide, mostly-NaN ``expand=True`` frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+class Tokens:
+    """Tokenized pipe-delimited column; see the module docstring."""
+
+    def __init__(self, codes, offsets, vocabulary, index=None, name=None):
+        self.codes = codes
+        self.offsets = offsets
+        self.vocabulary = vocabulary
+        self.index = pd.RangeIndex(len(offsets) - 1) if index is None else index
+        self.name = name
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return '{}({!r}: {} rows, {} tokens, {} distinct)'.format(
+            type(self).__name__, self.name, len(self), len(self.codes), len(self.vocabulary))
+
+    def lengths(self):
+        """Number of tokens in each row."""
+        return np.diff(self.offsets)
+
+    def row_ids(self):
+        """Row position of every token, aligned with ``codes``."""
+        return np.repeat(np.arange(len(self)), self.lengths())
+
+    def take(self, rows):
+        """Tokens of the rows selected by a boolean mask or positions."""
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return Tokens(self.codes[gather], offsets, self.vocabulary, self.index[rows], self.name)
+
+    def counts(self, rows=None):
+        """Occurrences of every vocabulary entry, optionally within ``rows``."""
+        codes = self.codes if rows is None else self.take(rows).codes
+        return np.bincount(codes, minlength=len(self.vocabulary))
+
+    def value_counts(self, rows=None):
+        """Token counts in descending order, like ``Series.value_counts``."""
+        counts = self.counts(rows)
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=pd.Index(self.vocabulary[order]), name='count')
+
+    def explode(self):
+        """One token per row, indexed by the row labels of the source column.
+
+        Equivalent to ``str.split('|', expand=True).stack()`` with the inner
+        level dropped.
+        """
+        return pd.Series(self.vocabulary[self.codes], index=self.index.repeat(self.lengths()), name=self.name)
+
+
+def _tokenize_objects(values, sep, chunk_size):
+    vocabulary = {}
+    codes = []
+    lengths = []
+    for start in range(0, len(values), chunk_size):
+        parts = values.iloc[start:start + chunk_size].str.split(sep, regex=False)
+        lengths.append(parts.str.len().fillna(0).to_numpy(dtype=np.int64))
+        local_codes, uniques = pd.factorize(parts.explode().dropna().to_numpy())
+        ids = np.array([vocabulary.setdefault(token, len(vocabulary)) for token in uniques], dtype=np.int32)
+        codes.append(ids[local_codes])
+
+    lengths = np.concatenate(lengths) if lengths else np.empty(0, dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int32)
+    return codes, offsets, np.array(list(vocabulary), dtype=object)
+
+
+def tokenize(values, sep='|', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Tokenize the pipe-delimited Series ``values``.
+
+    Missing values give rows with no tokens.  Object columns are split
+    ``chunk_size`` rows at a time so only one chunk of Python strings exists
+    at once; categorical columns only split their categories.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = tokenize(pd.Series(values.cat.categories, dtype=object), sep, chunk_size)
+        tokens = Tokens(categories.codes, categories.offsets, categories.vocabulary)
+        row_codes = values.cat.codes.to_numpy()
+        known = row_codes >= 0
+        by_row = tokens.take(row_codes[known])
+        lengths = np.zeros(len(values), dtype=np.int64)
+        lengths[known] = by_row.lengths()
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return Tokens(by_row.codes, offsets, tokens.vocabulary, values.index, values.name)
+
+    codes, offsets, vocabulary = _tokenize_objects(values, sep, chunk_size)
+    return Tokens(codes, offsets, vocabulary, values.index, values.name)
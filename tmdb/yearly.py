@@ -0,0 +1,166 @@
+"""Materialised per-year aggregates for ``profits_by_year``-style queries.
+
+``YearlyAggregates`` keeps count, sum, sum of squares, min and max of each
+numeric column per ``release_year``.  It is built in one pass (one sort by
+year, then a ``reduceat`` per statistic) and merged with new rows or other
+partitions by adding counts and sums and taking min/max.  Yearly totals,
+means, variances and "which year had the most ..." are then answered from
+a table with one row per year.
+
+Integer columns keep exact int64 sums; missing values are skipped.
+"""
+
+import numpy as np
+import pandas as pd
+
+from tmdb.columns import column_values
+
+STATS = ('count', 'sum', 'sumsq', 'min', 'max')
+
+
+def _aggregate(data, columns, year):
+    years = np.asarray(data[year], dtype=np.int64)
+    order = np.argsort(years, kind='stable')
+    unique_years, starts = np.unique(years[order], return_index=True)
+    return unique_years, _aggregate_sorted(data, columns, starts, order)
+
+
+def _aggregate_sorted(data, columns, starts, order=None):
+    """Statistics per group of rows starting at ``starts`` (after ``order``)."""
+    stats = {}
+    if not len(starts):
+        return stats
+
+    for column in columns:
+        values = column_values(data[column])
+        if order is not None:
+            values = values[order]
+        if values.dtype.kind == 'f':
+            present = ~np.isnan(values)
+            filled = np.where(present, values, 0.0)
+            count = np.add.reduceat(present.astype(np.int64), starts)
+        else:
+            filled = values
+            count = np.diff(np.append(starts, len(values)))
+        stats[column] = {
+            'count': count,
+            'sum': np.add.reduceat(filled, starts),
+            'sumsq': np.add.reduceat(filled.astype(np.float64) ** 2, starts),
+            'min': np.fmin.reduceat(values, starts),
+            'max': np.fmax.reduceat(values, starts),
+        }
+    return stats
+
+
+class YearlyAggregates:
+    """Per-year count, sum, sum of squares, min and max of numeric columns."""
+
+    def __init__(self, columns, year='release_year'):
+        self.columns = list(columns)
+        self.year = year
+        self.years = np.empty(0, dtype=np.int64)
+        self._stats = {column: {stat: np.empty(0) for stat in STATS} for column in self.columns}
+
+    @classmethod
+    def build(cls, data, columns=None, year='release_year'):
+        """Aggregate ``data``; ``columns`` defaults to its numeric columns."""
+        if columns is None:
+            columns = [c for c in data.select_dtypes('number').columns if c != year]
+        aggregates = cls(columns, year)
+        aggregates.append(data)
+        return aggregates
+
+    @classmethod
+    def from_sorted(cls, data, years, starts, columns, year='release_year'):
+        """Aggregate ``data`` already sorted by year; ``starts`` are the first
+        row of each of ``years``, e.g. the offsets of a ``TimeIndex``."""
+        aggregates = cls(columns, year)
+        aggregates._merge(np.asarray(years, dtype=np.int64), _aggregate_sorted(data, aggregates.columns, starts))
+        return aggregates
+
+    def append(self, data):
+        """Add the rows of ``data``."""
+        years, stats = _aggregate(data, self.columns, self.year)
+        self._merge(years, stats)
+
+    def merge(self, other):
+        """Add the aggregates of ``other`` (same columns), e.g. another partition."""
+        if other.columns != self.columns:
+            raise ValueError('cannot merge aggregates of different columns')
+        self._merge(other.years, other._stats)
+
+    def _merge(self, years, stats):
+        if not len(years):
+            return
+        if not len(self.years):
+            self.years = years
+            self._stats = stats
+            return
+        merged_years = np.union1d(self.years, years)
+        mine = np.searchsorted(merged_years, self.years)
+        theirs = np.searchsorted(merged_years, years)
+        for column in self.columns:
+            old = self._stats[column]
+            new = stats[column]
+            merged = {}
+            for stat in STATS:
+                dtype = np.result_type(old[stat], new[stat])
+                if stat in ('min', 'max'):
+                    combine = np.fmin if stat == 'min' else np.fmax
+                    values = np.full(len(merged_years), np.nan, dtype=np.result_type(dtype, np.float64))
+                    values[mine] = old[stat]
+                    values[theirs] = combine(values[theirs], new[stat])
+                    if dtype.kind in 'iu':
+                        values = values.astype(dtype)
+                else:
+                    values = np.zeros(len(merged_years), dtype=dtype)
+                    values[mine] = old[stat]
+                    values[theirs] += new[stat]
+                merged[stat] = values
+            self._stats[column] = merged
+        self.years = merged_years
+
+    def _series(self, values, column):
+        return pd.Series(values, index=pd.Index(self.years, name=self.year), name=column)
+
+    def count(self, column):
+        return self._series(self._stats[column]['count'], column)
+
+    def sum(self, column):
+        return self._series(self._stats[column]['sum'], column)
+
+    def min(self, column):
+        return self._series(self._stats[column]['min'], column)
+
+    def max(self, column):
+        return self._series(self._stats[column]['max'], column)
+
+    def mean(self, column):
+        stats = self._stats[column]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._series(stats['sum'] / stats['count'], column)
+
+    def var(self, column, ddof=1):
+        stats = self._stats[column]
+        count = stats['count']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            squares = stats['sumsq'] - stats['sum'].astype(np.float64) ** 2 / count
+            return self._series(np.maximum(squares, 0) / (count - ddof), column)
+
+    def std(self, column, ddof=1):
+        return np.sqrt(self.var(column, ddof))
+
+    def frame(self, column):
+        """All statistics of ``column`` as a DataFrame indexed by year."""
+        return pd.DataFrame({
+            'count': self.count(column),
+            'sum': self.sum(column),
+            'mean': self.mean(column),
+            'std': self.std(column),
+            'min': self.min(column),
+            'max': self.max(column),
+        })
+
+    def idxmax(self, column, stat='sum'):
+        """Year with the largest ``stat`` of ``column``, e.g. the most profitable year."""
+        return getattr(self, stat)(column).idxmax()